@@ -0,0 +1,132 @@
+import pytest  
+import pandas as pd  
+from unittest.mock import patch  
+import sys  
+import os  
+
+# Menambahkan path agar bisa import utils  
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  
+
+from utils.aggregate import RollupAggregator, ROLLUP_COLUMNS  
+from utils.load import load_rollups  
+
+
+def make_products(rows):  
+    return pd.DataFrame(rows, columns=['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender'])  
+
+
+def full_rollup(df):  
+    # Perhitungan ulang penuh sebagai pembanding  
+    grouped = df.groupby(['Gender', 'Size'])  
+    return pd.DataFrame({  
+        'Count': grouped.size(),  
+        'AvgPrice': grouped['Price'].mean().round(2),  
+        'MinPrice': grouped['Price'].min(),  
+        'MaxPrice': grouped['Price'].max(),  
+        'MinRating': grouped['Rating'].min(),  
+        'MaxRating': grouped['Rating'].max()  
+    }).reset_index()  
+
+
+@pytest.fixture  
+def first_batch():  
+    return make_products([  
+        ['Shirt A', 800000.0, 4.5, 3, 'M', 'Men'],  
+        ['Shirt B', 400000.0, 3.9, 2, 'M', 'Men'],  
+        ['Dress C', 950000.0, 4.8, 4, 'S', 'Women']  
+    ])  
+
+
+class TestAggregateFunctions:  
+    def test_initial_rollup(self, first_batch, tmp_path):  
+        aggregator = RollupAggregator(str(tmp_path / 'state.json'))  
+        
+        rollups = aggregator.update(first_batch)  
+        
+        assert list(rollups.columns) == ROLLUP_COLUMNS  
+        men = rollups[(rollups['Gender'] == 'Men') & (rollups['Size'] == 'M')].iloc[0]  
+        assert men['Count'] == 2  
+        assert men['AvgPrice'] == 600000.0  
+        assert men['MinPrice'] == 400000.0  
+        assert men['Rating_3_4'] == 1  
+        assert men['Rating_4_5'] == 1  
+
+    def test_incremental_matches_full_recompute(self, first_batch, tmp_path):  
+        state_path = str(tmp_path / 'state.json')  
+        RollupAggregator(state_path).update(first_batch)  
+        
+        # Batch berikutnya: Shirt B berubah harga, Dress C hilang, produk baru muncul  
+        second_batch = make_products([  
+            ['Shirt A', 800000.0, 4.5, 3, 'M', 'Men'],  
+            ['Shirt B', 900000.0, 3.9, 2, 'M', 'Men'],  
+            ['Jacket D', 1200000.0, 4.1, 5, 'L', 'Unisex']  
+        ])  
+        
+        # Instance baru membaca state yang dipersist dari run sebelumnya; hasilnya  
+        # sama dengan agregat penuh atas seluruh run yang dimuat ke PostgreSQL  
+        rollups = RollupAggregator(state_path).update(second_batch)  
+        expected = full_rollup(pd.concat([first_batch, second_batch]))  
+        
+        merged = rollups.merge(expected, on=['Gender', 'Size'], suffixes=('', '_expected'))  
+        assert len(rollups) == len(expected) == len(merged)  
+        for column in ['Count', 'AvgPrice', 'MinPrice', 'MaxPrice', 'MinRating', 'MaxRating']:  
+            assert (merged[column] == merged[f'{column}_expected']).all()  
+
+    def test_replace_mode_describes_latest_snapshot(self, first_batch, tmp_path):  
+        state_path = tmp_path / 'state.json'  
+        aggregator = RollupAggregator(str(state_path), replace=True)  
+        aggregator.update(first_batch)  
+        
+        second_batch = first_batch[first_batch['Gender'] == 'Men']  
+        rollups = aggregator.update(second_batch)  
+        
+        assert 'Women' not in set(rollups['Gender'])  
+        assert rollups['Count'].sum() == len(second_batch)  
+        assert not state_path.exists()  
+
+    def test_append_mode_accumulates(self, first_batch, tmp_path):  
+        aggregator = RollupAggregator(str(tmp_path / 'state.json'))  
+        
+        aggregator.update(first_batch)  
+        rollups = aggregator.update(first_batch)  
+        
+        men = rollups[(rollups['Gender'] == 'Men') & (rollups['Size'] == 'M')].iloc[0]  
+        assert men['Count'] == 4  
+        assert men['MinPrice'] == 400000.0  
+        assert men['Rating_4_5'] == 2  
+
+    def test_state_is_per_group_only(self, first_batch, tmp_path):  
+        state_path = str(tmp_path / 'state.json')  
+        
+        # Banyak produk dalam satu grup tetap menghasilkan satu entri state  
+        batch = make_products([  
+            [f'Shirt {i}', 100000.0 + i, 4.0, 1, 'M', 'Men'] for i in range(500)  
+        ])  
+        RollupAggregator(state_path).update(batch)  
+        
+        state = RollupAggregator(state_path).state  
+        assert set(state) == {'groups'}  
+        assert list(state['groups']) == ['Men|M']  
+        assert state['groups']['Men|M']['count'] == 500  
+
+    def test_empty_batch_keeps_rollups(self, first_batch, tmp_path):  
+        aggregator = RollupAggregator(str(tmp_path / 'state.json'))  
+        aggregator.update(first_batch)  
+        
+        rollups = aggregator.update(pd.DataFrame())  
+        assert rollups['Count'].sum() == 3  
+
+    @patch('utils.load.DataLoader.save_rollups_to_postgresql', return_value=True)  
+    def test_load_rollups(self, mock_save_postgresql, first_batch, tmp_path):  
+        rollups = RollupAggregator(str(tmp_path / 'state.json')).update(first_batch)  
+        csv_path = tmp_path / 'rollups.csv'  
+        
+        result = load_rollups(  
+            rollups,  
+            csv_path=str(csv_path),  
+            postgresql_config={'connection_string': 'postgresql://localhost/db'}  
+        )  
+        
+        assert result == {'csv': True, 'postgresql': True, 'google_sheets': False}  
+        assert len(pd.read_csv(csv_path)) == len(rollups)  
+        mock_save_postgresql.assert_called_once()  
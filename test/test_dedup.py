@@ -0,0 +1,80 @@
+import pytest  
+import numpy as np  
+import pandas as pd  
+import sys  
+import os  
+
+# Menambahkan path agar bisa import utils  
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  
+
+from utils.dedup import NearDuplicateDetector, lsh_parameters, normalize_title  
+
+
+@pytest.fixture  
+def catalogue():  
+    return pd.DataFrame({  
+        'Title': [  
+            'Crewneck T-Shirt 12',  
+            'crewneck t shirt 12!',  
+            'Crewneck  T-Shirt 12 ',  
+            'Crewneck T-Shirt 12',  
+            'T-shirt 2',  
+            'T-shirt 21',  
+            'Oversized Denim Jacket',  
+            'Oversized Denim Jackets'  
+        ],  
+        'Price': [800000.0, 800000.0, 800000.0, 800000.0, 500000.0, 650000.0, 1200000.0, 1200000.0],  
+        'Size': ['M', 'M', 'M', 'M', 'L', 'L', 'XL', 'XL'],  
+        'Gender': ['Men', 'Men', 'Men', 'Women', 'Unisex', 'Unisex', 'Women', 'Women']  
+    })  
+
+
+class TestDedupFunctions:  
+    def test_normalize_title(self):  
+        assert normalize_title('  Crewneck  T-Shirt 12! ') == 'crewneck t shirt 12'  
+        assert normalize_title('Café Hoodie') == 'cafe hoodie'  
+
+    def test_lsh_parameters_favour_recall(self):  
+        bands, rows = lsh_parameters(0.8, 64)  
+        
+        assert bands * rows == 64  
+        assert (1.0 / bands) ** (1.0 / rows) <= 0.8  
+
+    def test_near_duplicates_grouped_within_block(self, catalogue):  
+        detector = NearDuplicateDetector(threshold=0.8)  
+        labels = detector.find_clusters(catalogue)  
+        
+        # Variasi judul dengan Size/Gender/harga sama menjadi satu produk  
+        assert list(labels[:3]) == [0, 0, 0]  
+        # Gender berbeda tetap produk terpisah  
+        assert labels[3] == 3  
+        # Judul mirip tetapi harga berbeda tidak digabung  
+        assert labels[4] != labels[5]  
+        assert labels[7] == 6  
+
+    def test_deduplicate_keeps_first_occurrence(self, catalogue):  
+        result = NearDuplicateDetector(threshold=0.8).deduplicate(catalogue)  
+        
+        assert list(result.index) == [0, 3, 4, 5, 6]  
+
+    def test_threshold_one_only_merges_normalized_titles(self, catalogue):  
+        result = NearDuplicateDetector(threshold=1.0).deduplicate(catalogue)  
+        
+        assert list(result.index) == [0, 3, 4, 5, 6, 7]  
+
+    def test_candidates_scale_linearly(self):  
+        rng = np.random.default_rng(0)  
+        words = ['Classic', 'Denim', 'Hoodie', 'Jacket', 'Shirt', 'Pants', 'Dress', 'Outerwear']  
+        titles = [f"{rng.choice(words)} {rng.choice(words)} {i}" for i in range(5000)]  
+        df = pd.DataFrame({  
+            'Title': titles,  
+            'Price': rng.integers(1, 100, size=5000) * 16000.0,  
+            'Size': rng.choice(['S', 'M', 'L', 'XL', 'XXL'], size=5000),  
+            'Gender': rng.choice(['Men', 'Women', 'Unisex'], size=5000)  
+        })  
+        
+        detector = NearDuplicateDetector(threshold=0.9)  
+        detector.find_clusters(df)  
+        
+        # Jauh di bawah n^2 / 2 pasangan pada pembanding naif  
+        assert detector.last_stats['candidates'] < 5000 * 20  
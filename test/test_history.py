@@ -0,0 +1,176 @@
+import pytest  
+import json  
+import numpy as np  
+import pandas as pd  
+import sys  
+import os  
+
+# Menambahkan path agar bisa import utils  
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  
+
+import utils.history as history_module  
+from utils.history import PriceHistoryStore, INDEX_DTYPE, RECORD_DTYPE  
+
+
+def make_batch(timestamp, prices):  
+    return pd.DataFrame({  
+        'Title': list(prices.keys()),  
+        'Price': [price for price, _ in prices.values()],  
+        'Rating': [rating for _, rating in prices.values()],  
+        'Colors': [3] * len(prices),  
+        'Size': ['M'] * len(prices),  
+        'Gender': ['Men'] * len(prices),  
+        'Timestamp': [timestamp] * len(prices)  
+    })  
+
+
+@pytest.fixture  
+def store(tmp_path):  
+    store = PriceHistoryStore(str(tmp_path / 'history'))  
+    store.append(make_batch('2025-05-01T10:00:00+00:00', {'Shirt A': (800000.0, 4.5), 'Pants B': (600000.0, 4.0)}))  
+    store.append(make_batch('2025-05-02T10:00:00+00:00', {'Shirt A': (800000.0, 4.5), 'Pants B': (550000.0, 4.0)}))  
+    store.append(make_batch('2025-05-03T10:00:00+00:00', {'Shirt A': (750000.0, 4.6), 'Pants B': (550000.0, 4.0)}))  
+    return store  
+
+
+class TestHistoryFunctions:  
+    def test_unchanged_values_are_not_stored(self, store):  
+        stats = store.stats()  
+        
+        # 2 nilai awal + 1 perubahan Pants B + 1 perubahan Shirt A  
+        assert stats['records'] == 4  
+        assert stats['products'] == 2  
+        assert stats['bytes'] == 4 * RECORD_DTYPE.itemsize  
+        assert os.path.getsize(store.data_path) == stats['bytes']  
+
+    def test_product_history(self, store):  
+        history = store.history('Shirt A')  
+        
+        assert list(history['Price']) == [800000.0, 750000.0]  
+        assert list(history['Rating']) == [4.5, 4.6]  
+        assert history['Timestamp'].iloc[1] == pd.Timestamp('2025-05-03T10:00:00+00:00', tz='UTC')  
+
+    def test_history_range_includes_value_in_effect(self, store):  
+        history = store.history('Shirt A', start='2025-05-02T00:00:00+00:00')  
+        assert list(history['Price']) == [800000.0, 750000.0]  
+        
+        history = store.history('Shirt A', start='2025-05-02T00:00:00+00:00', include_previous=False)  
+        assert list(history['Price']) == [750000.0]  
+
+    def test_time_range_query(self, store):  
+        changes = store.range('2025-05-02T00:00:00+00:00', '2025-05-02T23:59:59+00:00')  
+        
+        assert list(changes['Title']) == ['Pants B']  
+        assert list(changes['Price']) == [550000.0]  
+
+    def test_price_at(self, store):  
+        assert store.price_at('Pants B', '2025-05-01T12:00:00+00:00')['Price'] == 600000.0  
+        assert store.price_at('Pants B', '2025-05-05T00:00:00+00:00')['Price'] == 550000.0  
+        assert store.price_at('Pants B', '2025-04-01T00:00:00') is None  
+        assert store.price_at('Unknown', '2025-05-05T00:00:00+00:00') is None  
+
+    def test_reopen_uses_memory_map(self, store):  
+        reopened = PriceHistoryStore(store.directory)  
+        
+        assert isinstance(reopened.records, np.memmap)  
+        assert reopened.stats() == store.stats()  
+        
+        # Nilai terakhir dipulihkan dari file sehingga nilai sama tetap dilewati  
+        written = reopened.append(make_batch('2025-05-04T10:00:00+00:00', {'Shirt A': (750000.0, 4.6)}))  
+        assert written == 0  
+        assert reopened.last_seen[str(reopened.product_ids['Shirt A'])] > 0  
+
+    def test_price_at_after_product_disappears(self, store):  
+        store.append(make_batch('2025-05-04T10:00:00+00:00', {'Shirt A': (750000.0, 4.6)}))  
+        
+        # Pants B tidak muncul lagi setelah 2025-05-03  
+        assert store.price_at('Pants B', '2025-05-03T12:00:00+00:00')['Price'] == 550000.0  
+        assert store.price_at('Pants B', '2025-05-04T10:00:00+00:00') is None  
+        assert store.price_at('Shirt A', '2025-05-04T10:00:00+00:00')['Price'] == 750000.0  
+        
+        # Muncul lagi di run berikutnya berarti harganya berlaku kembali  
+        store.append(make_batch('2025-05-05T10:00:00+00:00', {'Pants B': (550000.0, 4.0)}))  
+        assert store.price_at('Pants B', '2025-05-05T10:00:00+00:00')['Price'] == 550000.0  
+        
+        # Ketiadaan tersimpan di file, bukan hanya di metadata yang bisa berubah  
+        reopened = PriceHistoryStore(store.directory)  
+        assert reopened.price_at('Pants B', '2025-05-04T12:00:00+00:00') is None  
+        assert reopened.price_at('Shirt A', '2025-05-05T12:00:00+00:00') is None  
+
+    def test_gap_with_unchanged_price_on_return(self, tmp_path):  
+        store = PriceHistoryStore(str(tmp_path / 'gap'))  
+        store.append(make_batch('2025-05-01T10:00:00+00:00', {'Shirt A': (800000.0, 4.5), 'Pants B': (600000.0, 4.0)}))  
+        store.append(make_batch('2025-05-02T10:00:00+00:00', {'Shirt A': (800000.0, 4.5)}))  
+        store.append(make_batch('2025-05-03T10:00:00+00:00', {'Shirt A': (800000.0, 4.5), 'Pants B': (600000.0, 4.0)}))  
+        
+        assert store.price_at('Pants B', '2025-05-01T12:00:00+00:00')['Price'] == 600000.0  
+        assert store.price_at('Pants B', '2025-05-02T12:00:00+00:00') is None  
+        assert store.price_at('Pants B', '2025-05-03T12:00:00+00:00')['Price'] == 600000.0  
+        
+        # Kembalinya produk menjadi titik perubahan baru walaupun harganya sama  
+        history = store.history('Pants B')  
+        assert list(history['Price']) == [600000.0, 600000.0]  
+        assert history['Timestamp'].iloc[1] == pd.Timestamp('2025-05-03T10:00:00+00:00', tz='UTC')  
+        assert store.stats()['records'] == 4  
+
+    def test_index_is_persisted_per_segment(self, store):  
+        assert store.stats()['segments'] == 3  
+        assert os.path.getsize(store.index_path) == 4 * INDEX_DTYPE.itemsize  
+        
+        # Store dibuka ulang dari indeks yang tersimpan, bukan dari pengurutan ulang  
+        reopened = PriceHistoryStore(store.directory)  
+        assert isinstance(reopened.index, np.memmap)  
+        assert list(reopened.history('Pants B')['Price']) == [600000.0, 550000.0]  
+
+    def test_segments_are_merged_past_limit(self, tmp_path, monkeypatch):  
+        monkeypatch.setattr(history_module, 'MAX_SEGMENTS', 3)  
+        store = PriceHistoryStore(str(tmp_path / 'merged'))  
+        for day in range(1, 9):  
+            store.append(make_batch(f'2025-05-0{day}T10:00:00+00:00', {  
+                'Shirt A': (800000.0 - day * 1000, 4.5),  
+                'Pants B': (600000.0 + day * 1000, 4.0)  
+            }))  
+        
+        # Jumlah segmen tetap terbatas dan indeks lama sudah dibuang  
+        assert store.stats()['segments'] <= 3  
+        assert os.path.basename(store.index_path) != 'index.bin'  
+        assert sorted(f for f in os.listdir(store.directory) if f.startswith('index')) == [os.path.basename(store.index_path)]  
+        
+        expected = [800000.0 - day * 1000 for day in range(1, 9)]  
+        assert list(store.history('Shirt A')['Price']) == expected  
+        
+        reopened = PriceHistoryStore(store.directory)  
+        assert reopened.index_path == store.index_path  
+        assert list(reopened.history('Shirt A')['Price']) == expected  
+        assert reopened.price_at('Pants B', '2025-05-04T12:00:00+00:00')['Price'] == 604000.0  
+
+    def test_legacy_store_without_index(self, store):  
+        # Store lama hanya punya judul dan last_seen di metadata  
+        with open(store.meta_path, 'w') as f:  
+            json.dump({'titles': store.titles, 'last_seen': store.last_seen}, f)  
+        os.remove(store.index_path)  
+        
+        reopened = PriceHistoryStore(store.directory)  
+        
+        assert reopened.stats()['segments'] == 1  
+        assert list(reopened.history('Shirt A')['Price']) == [800000.0, 750000.0]  
+        assert reopened.append(make_batch('2025-05-04T10:00:00+00:00', {'Shirt A': (750000.0, 4.6)})) == 0  
+
+    def test_uncommitted_tail_is_ignored(self, store):  
+        # Tulisan yang terputus sebelum metadata diperbarui tidak terbaca  
+        with open(store.data_path, 'ab') as f:  
+            f.write(b'\x00' * (RECORD_DTYPE.itemsize + 5))  
+        
+        reopened = PriceHistoryStore(store.directory)  
+        assert reopened.stats()['records'] == 4  
+        
+        reopened.append(make_batch('2025-05-04T10:00:00+00:00', {'Shirt A': (700000.0, 4.6), 'Pants B': (550000.0, 4.0)}))  
+        assert os.path.getsize(reopened.data_path) == 5 * RECORD_DTYPE.itemsize  
+        assert list(reopened.history('Shirt A')['Price']) == [800000.0, 750000.0, 700000.0]  
+
+    def test_empty_store(self, tmp_path):  
+        store = PriceHistoryStore(str(tmp_path / 'empty'))  
+        
+        assert store.history('Shirt A').empty  
+        assert store.range().empty  
+        assert store.append(pd.DataFrame()) == 0  
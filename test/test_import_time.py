@@ -0,0 +1,63 @@
+import subprocess  
+import sys  
+import os  
+import json  
+
+# Direktori proyek sebagai working directory subprocess  
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))  
+
+# Modul berat yang tidak boleh ikut terimpor saat `import main`  
+HEAVY_MODULES = [  
+    'sqlalchemy',  
+    'googleapiclient',  
+    'google.oauth2',  
+    'requests',  
+    'bs4'  
+]  
+
+# Batas longgar waktu impor `main` di luar pandas/numpy  
+IMPORT_BUDGET_SECONDS = 1.0  
+
+PROBE = '''  
+import json, sys, time  
+import pandas, numpy  
+start = time.perf_counter()  
+import main  
+elapsed = time.perf_counter() - start  
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))  
+'''  
+
+
+def run_probe(code):  
+    output = subprocess.run(  
+        [sys.executable, '-c', code],  
+        cwd=PROJECT_DIR,  
+        capture_output=True,  
+        text=True,  
+        check=True  
+    ).stdout  
+    return json.loads(output.strip().splitlines()[-1])  
+
+
+class TestImportTime:  
+    def test_main_does_not_import_sink_dependencies(self):  
+        result = run_probe(PROBE)  
+        
+        loaded = [name for name in HEAVY_MODULES if name in result['modules']]  
+        assert loaded == []  
+
+    def test_main_import_budget(self):  
+        result = run_probe(PROBE)  
+        assert result['elapsed'] < IMPORT_BUDGET_SECONDS  
+
+    def test_sink_dependency_loaded_on_demand(self):  
+        result = run_probe(  
+            'import json, sys\n'  
+            'import utils.load as load\n'  
+            'before = "sqlalchemy" in sys.modules\n'  
+            'load.DataLoader()._get_engine("sqlite://")\n'  
+            'print(json.dumps({"before": before, "after": "sqlalchemy" in sys.modules,'  
+            ' "sheets": "googleapiclient" in sys.modules}))\n'  
+        )  
+        
+        assert result == {'before': False, 'after': True, 'sheets': False}  
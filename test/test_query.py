@@ -0,0 +1,115 @@
+import sys  
+import os  
+import tempfile  
+import threading  
+import unittest  
+import numpy as np  
+import pandas as pd  
+
+# Tambahkan path parent directory  
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  
+
+from utils.query import ProductIndex, ProductSnapshotStore  
+
+
+class TestQueryFunctions(unittest.TestCase):  
+    def setUp(self):  
+        self.sample_products = pd.DataFrame({  
+            'Title': ['Shirt A', 'Shirt B', 'Jacket C', 'Pants D', 'Hoodie E', 'Dress F'],  
+            'Price': [800000.0, 400000.0, 1200000.0, 600000.0, 400000.0, 950000.0],  
+            'Rating': [4.5, 3.9, 4.8, 4.1, 4.9, 3.5],  
+            'Colors': [3, 2, 5, 3, 1, 4],  
+            'Size': ['M', 'M', 'L', 'M', 'XL', 'M'],  
+            'Gender': ['Men', 'Men', 'Unisex', 'Women', 'Men', 'Women'],  
+            'Timestamp': ['2025-05-10T10:00:00'] * 6  
+        })  
+        self.index = ProductIndex(self.sample_products)  
+
+    def test_filter_by_gender_size_and_price(self):  
+        result = self.index.query(gender='Men', size='M', max_price=800000.0)  
+        
+        self.assertEqual([row['Title'] for row in result], ['Shirt B', 'Shirt A'])  
+        self.assertEqual(result[0]['Gender'], 'Men')  
+        self.assertEqual(result[0]['Size'], 'M')  
+
+    def test_price_range_and_descending_sort(self):  
+        result = self.index.query(min_price=600000.0, max_price=1000000.0, ascending=False)  
+        
+        self.assertEqual([row['Title'] for row in result], ['Dress F', 'Shirt A', 'Pants D'])  
+
+    def test_top_k_by_rating(self):  
+        result = self.index.query(sort_by='Rating', ascending=False, limit=2)  
+        self.assertEqual([row['Title'] for row in result], ['Hoodie E', 'Jacket C'])  
+        
+        result = self.index.query(size='M', sort_by='Rating', limit=2)  
+        self.assertEqual([row['Title'] for row in result], ['Dress F', 'Shirt B'])  
+
+    def test_rating_filter(self):  
+        result = self.index.query(gender='Men', min_rating=4.0)  
+        self.assertEqual([row['Title'] for row in result], ['Hoodie E', 'Shirt A'])  
+
+    def test_inclusive_rating_bounds(self):  
+        # Batas float64 harus cocok persis dengan rating yang tersimpan  
+        result = self.index.query(min_rating=np.float64(4.1), max_rating=np.float64(4.5))  
+        self.assertEqual([row['Title'] for row in result], ['Pants D', 'Shirt A'])  
+        
+        result = self.index.query(min_rating=4.1, max_rating=4.1, sort_by='Rating')  
+        self.assertEqual([row['Title'] for row in result], ['Pants D'])  
+
+    def test_negative_limit_rejected(self):  
+        for sort_by in ('Price', 'Rating'):  
+            with self.assertRaises(ValueError):  
+                self.index.query(sort_by=sort_by, limit=-1)  
+
+    def test_unknown_values_return_empty(self):  
+        self.assertEqual(self.index.query(gender='Kids'), [])  
+        self.assertEqual(self.index.query(size='XXS'), [])  
+        self.assertEqual(self.index.query(sort_by='Rating', limit=0), [])  
+        self.assertEqual(self.index.query(limit=0), [])  
+        
+        with self.assertRaises(ValueError):  
+            self.index.query(sort_by='Title')  
+
+    def test_store_hot_swap(self):  
+        store = ProductSnapshotStore(csv_path='unused.csv')  
+        self.assertEqual(store.query(gender='Men'), [])  
+        
+        first = store.publish(self.sample_products)  
+        second = store.publish(self.sample_products.head(2))  
+        
+        self.assertIs(store.current, second)  
+        self.assertGreater(second.version, first.version)  
+        self.assertEqual(len(store.query()), 2)  
+
+    def test_store_concurrent_readers(self):  
+        store = ProductSnapshotStore(csv_path='unused.csv')  
+        store.publish(self.sample_products)  
+        sizes = []  
+
+        def reader():  
+            for _ in range(200):  
+                sizes.append(len(store.query(gender='Men')))  
+        
+        threads = [threading.Thread(target=reader) for _ in range(4)]  
+        for thread in threads:  
+            thread.start()  
+        store.publish(self.sample_products[self.sample_products['Gender'] == 'Men'])  
+        for thread in threads:  
+            thread.join()  
+        
+        self.assertTrue(all(size == 3 for size in sizes))  
+
+    def test_store_load_latest_from_csv(self):  
+        with tempfile.TemporaryDirectory() as tmp_dir:  
+            csv_path = os.path.join(tmp_dir, 'products.csv')  
+            self.sample_products.to_csv(csv_path, index=False)  
+            
+            store = ProductSnapshotStore(csv_path=csv_path)  
+            index = store.load_latest()  
+            
+            self.assertEqual(len(index), 6)  
+            self.assertEqual(store.query(gender='Unisex')[0]['Title'], 'Jacket C')  
+
+
+if __name__ == '__main__':  
+    unittest.main()  
@@ -0,0 +1,205 @@
+import threading  
+import time  
+import unittest  
+import sys  
+import os  
+from datetime import datetime, timezone  
+from unittest.mock import patch, MagicMock  
+
+# Tambahkan path parent directory  
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  
+
+from utils.ratelimit import AdaptiveConcurrencyController, parse_retry_after  
+from utils.extract import DataExtractor  
+
+
+class FakeClock:  
+    def __init__(self):  
+        self.now = 100.0  
+
+    def __call__(self):  
+        return self.now  
+
+    def advance(self, seconds):  
+        self.now += seconds  
+
+
+class TestRateLimitFunctions(unittest.TestCase):  
+    def setUp(self):  
+        self.clock = FakeClock()  
+        self.controller = AdaptiveConcurrencyController(  
+            initial_limit=2,  
+            max_limit=8,  
+            latency_target=1.0,  
+            clock=self.clock  
+        )  
+
+    def complete(self, host, latency=0.1, status_code=200, retry_after=None):  
+        slot = self.controller.acquire(host)  
+        self.clock.advance(latency)  
+        slot.record(status_code, retry_after)  
+        self.controller.release(slot)  
+
+    def test_additive_increase_on_fast_success(self):  
+        for _ in range(20):  
+            self.complete('shop.example')  
+        
+        self.assertGreater(self.controller.current_limit('shop.example'), 2)  
+        self.assertLessEqual(self.controller.current_limit('shop.example'), 8)  
+
+    def test_multiplicative_decrease_on_throttle(self):  
+        for _ in range(30):  
+            self.complete('shop.example')  
+        before = self.controller.snapshot()['shop.example']['limit']  
+        
+        self.complete('shop.example', status_code=429)  
+        
+        after = self.controller.snapshot()['shop.example']  
+        self.assertAlmostEqual(after['limit'], max(1.0, before * 0.5), places=1)  
+        self.assertEqual(after['throttled'], 1)  
+
+    def test_high_latency_decreases_limit(self):  
+        for _ in range(5):  
+            self.complete('slow.example', latency=3.0)  
+        
+        self.assertEqual(self.controller.current_limit('slow.example'), 1)  
+
+    def test_retry_after_blocks_host(self):  
+        self.complete('shop.example', status_code=503, retry_after='30')  
+        
+        self.assertIsNone(self.controller.acquire('shop.example', timeout=0))  
+        self.assertGreater(self.controller.snapshot()['shop.example']['cooldown_remaining'], 29)  
+        
+        # Host lain memiliki anggaran sendiri  
+        self.assertIsNotNone(self.controller.acquire('other.example', timeout=0))  
+        
+        self.clock.advance(31)  
+        self.assertIsNotNone(self.controller.acquire('shop.example', timeout=0))  
+
+    def test_retry_after_is_clamped(self):  
+        controller = AdaptiveConcurrencyController(max_retry_after=60, clock=self.clock)  
+        slot = controller.acquire('shop.example')  
+        slot.record(429, '86400')  
+        controller.release(slot)  
+        
+        self.assertEqual(controller.snapshot()['shop.example']['cooldown_remaining'], 60)  
+        self.clock.advance(61)  
+        self.assertIsNotNone(controller.acquire('shop.example', timeout=0))  
+        
+        with self.assertRaises(ValueError):  
+            AdaptiveConcurrencyController(max_retry_after=-1)  
+
+    def test_throttle_without_retry_after_backs_off(self):  
+        controller = AdaptiveConcurrencyController(  
+            backoff_base=1.0, max_retry_after=3, clock=self.clock, jitter=lambda: 1.0  
+        )  
+        cooldowns = []  
+        for _ in range(4):  
+            slot = controller.acquire('shop.example', timeout=0)  
+            self.assertIsNotNone(slot)  
+            slot.record(429)  
+            controller.release(slot)  
+            cooldowns.append(controller.snapshot()['shop.example']['cooldown_remaining'])  
+            
+            # Percobaan langsung ditolak sampai jeda selesai  
+            self.assertIsNone(controller.acquire('shop.example', timeout=0))  
+            self.clock.advance(cooldowns[-1])  
+        
+        # Berlipat dua setiap throttle beruntun, dibatasi max_retry_after  
+        self.assertEqual(cooldowns, [1.0, 2.0, 3.0, 3.0])  
+        
+        # Respons sukses mengembalikan jeda ke nilai awal; jitter memperpendek jeda  
+        slot = controller.acquire('shop.example', timeout=0)  
+        slot.record(200)  
+        controller.release(slot)  
+        controller.jitter = lambda: 0.0  
+        slot = controller.acquire('shop.example', timeout=0)  
+        slot.record(503)  
+        controller.release(slot)  
+        self.assertEqual(controller.snapshot()['shop.example']['cooldown_remaining'], 0.5)  
+
+    def test_limit_caps_in_flight_requests(self):  
+        first = self.controller.acquire('shop.example', timeout=0)  
+        second = self.controller.acquire('shop.example', timeout=0)  
+        
+        self.assertIsNotNone(first)  
+        self.assertIsNotNone(second)  
+        self.assertIsNone(self.controller.acquire('shop.example', timeout=0))  
+        self.assertEqual(self.controller.snapshot()['shop.example']['in_flight'], 2)  
+
+    def test_parse_retry_after(self):  
+        self.assertEqual(parse_retry_after('120'), 120.0)  
+        self.assertIsNone(parse_retry_after(None))  
+        self.assertIsNone(parse_retry_after('soon'))  
+        
+        now = datetime(2025, 5, 10, 10, 0, 0, tzinfo=timezone.utc)  
+        self.assertEqual(parse_retry_after('Sat, 10 May 2025 10:00:30 GMT', now=now), 30.0)  
+
+    def test_extractor_retries_throttled_page(self):  
+        throttled = MagicMock(status_code=429, headers={'Retry-After': '0'})  
+        ok = MagicMock(status_code=200, headers={}, content='<div class="collection-card"></div>')  
+        
+        with patch('utils.extract.requests.Session.get', side_effect=[throttled, ok]) as mock_get:  
+            extractor = DataExtractor(max_pages=1)  
+            products = extractor.scrape_products()  
+        
+        self.assertEqual(products, [])  
+        self.assertEqual(mock_get.call_count, 2)  
+        stats = extractor.rate_controller.snapshot()['fashion-studio.dicoding.dev']  
+        self.assertEqual(stats['throttled'], 1)  
+        self.assertEqual(stats['requests'], 2)  
+
+    def test_extractor_waits_before_retrying_without_retry_after(self):  
+        throttled = MagicMock(status_code=429, headers={})  
+        ok = MagicMock(status_code=200, headers={}, content='<div class="collection-card"></div>')  
+        calls = []  
+
+        def fake_get(url, timeout=None):  
+            calls.append(time.monotonic())  
+            return [throttled, ok][len(calls) - 1]  
+        
+        controller = AdaptiveConcurrencyController(backoff_base=0.2, jitter=lambda: 0.0)  
+        with patch('utils.extract.requests.Session.get', side_effect=fake_get):  
+            extractor = DataExtractor(max_pages=1, rate_controller=controller)  
+            extractor.scrape_products()  
+        
+        self.assertEqual(len(calls), 2)  
+        self.assertGreaterEqual(calls[1] - calls[0], 0.1)  
+
+    def test_extractor_gives_up_on_long_retry_after(self):  
+        throttled = MagicMock(status_code=503, headers={'Retry-After': '3600'})  
+        
+        with patch('utils.extract.requests.Session.get', return_value=throttled) as mock_get:  
+            extractor = DataExtractor(max_pages=1, timeout=5)  
+            products = extractor.scrape_products()  
+        
+        self.assertEqual(products, [])  
+        self.assertEqual(mock_get.call_count, 1)  
+        stats = extractor.rate_controller.snapshot()['fashion-studio.dicoding.dev']  
+        self.assertLessEqual(stats['cooldown_remaining'], 5)  
+
+    def test_extractor_respects_concurrency_limit(self):  
+        controller = AdaptiveConcurrencyController(initial_limit=2, max_limit=2)  
+        active = []  
+        peak = []  
+        lock = threading.Lock()  
+
+        def fake_get(url, timeout=None):  
+            with lock:  
+                active.append(url)  
+                peak.append(len(active))  
+            threading.Event().wait(0.02)  
+            with lock:  
+                active.remove(url)  
+            return MagicMock(status_code=200, headers={}, content='')  
+        
+        with patch('utils.extract.requests.Session.get', side_effect=fake_get):  
+            extractor = DataExtractor(max_pages=8, rate_controller=controller)  
+            extractor.scrape_products()  
+        
+        self.assertLessEqual(max(peak), 2)  
+        self.assertEqual(len(peak), 8)  
+
+
+if __name__ == '__main__':  
+    unittest.main()  
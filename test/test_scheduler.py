@@ -0,0 +1,166 @@
+import json  
+import threading  
+import time  
+import unittest  
+import sys  
+import os  
+import tempfile  
+from datetime import datetime  
+
+# Tambahkan path parent directory  
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  
+
+from utils.scheduler import CronSchedule, PipelineDaemon, RunLock  
+
+
+class BlockingPipeline:  
+    """Pipeline tiruan yang menunggu sinyal sebelum selesai"""  
+
+    def __init__(self):  
+        self.calls = 0  
+        self.started = threading.Event()  
+        self.release = threading.Event()  
+
+    def run(self):  
+        self.calls += 1  
+        self.started.set()  
+        self.release.wait(5)  
+        return {'csv': True}  
+
+
+def wait_until(condition, timeout=5):  
+    deadline = time.monotonic() + timeout  
+    while time.monotonic() < deadline:  
+        if condition():  
+            return True  
+        time.sleep(0.01)  
+    return False  
+
+
+class TestSchedulerFunctions(unittest.TestCase):  
+    def setUp(self):  
+        self.tmp_dir = tempfile.TemporaryDirectory()  
+        self.lock_path = os.path.join(self.tmp_dir.name, 'etl.lock')  
+        self.status_path = os.path.join(self.tmp_dir.name, 'status.json')  
+
+    def tearDown(self):  
+        self.tmp_dir.cleanup()  
+
+    def test_cron_next_run(self):  
+        schedule = CronSchedule('*/15 * * * *')  
+        self.assertEqual(schedule.next_after(datetime(2025, 5, 10, 10, 7, 30)), datetime(2025, 5, 10, 10, 15))  
+        
+        schedule = CronSchedule('30 2 * * 1')  
+        # 10 Mei 2025 adalah hari Sabtu; Senin berikutnya 12 Mei  
+        self.assertEqual(schedule.next_after(datetime(2025, 5, 10, 10, 0)), datetime(2025, 5, 12, 2, 30))  
+        
+        schedule = CronSchedule('0 0 1 1-12/6 *')  
+        self.assertEqual(schedule.next_after(datetime(2025, 2, 1)), datetime(2025, 7, 1, 0, 0))  
+        
+        # '*/2' tidak membatasi sehingga kedua kolom harus cocok: Senin bertanggal ganjil  
+        schedule = CronSchedule('0 0 */2 * 1')  
+        self.assertEqual(schedule.next_after(datetime(2025, 5, 10, 10, 0)), datetime(2025, 5, 19, 0, 0))  
+
+    def test_invalid_cron(self):  
+        for expression in ['* * * *', '60 * * * *', '*/0 * * * *', '5-1 * * * *']:  
+            with self.assertRaises(ValueError):  
+                CronSchedule(expression)  
+
+    def test_run_lock_is_exclusive(self):  
+        first = RunLock(self.lock_path)  
+        second = RunLock(self.lock_path)  
+        
+        self.assertTrue(first.acquire())  
+        self.assertFalse(second.acquire())  
+        
+        first.release()  
+        self.assertTrue(second.acquire())  
+        second.release()  
+
+    def test_overlapping_trigger_is_skipped(self):  
+        pipeline = BlockingPipeline()  
+        daemon = PipelineDaemon(pipeline, interval=60, lock_path=self.lock_path, status_path=self.status_path)  
+        
+        self.assertTrue(daemon.trigger())  
+        self.assertTrue(pipeline.started.wait(5))  
+        self.assertFalse(daemon.trigger())  
+        
+        pipeline.release.set()  
+        daemon.stop(timeout=5)  
+        
+        status = daemon.status()  
+        self.assertEqual(pipeline.calls, 1)  
+        self.assertEqual(status['skipped'], 1)  
+        self.assertEqual(status['runs'], 1)  
+        self.assertEqual(status['last_result'], 'success')  
+        
+        with open(self.status_path) as f:  
+            self.assertEqual(json.load(f)['last_load_result'], {'csv': True})  
+
+    def test_overlapping_triggers_are_queued_once(self):  
+        pipeline = BlockingPipeline()  
+        daemon = PipelineDaemon(pipeline, interval=60, lock_path=self.lock_path, overlap='queue')  
+        
+        daemon.trigger()  
+        self.assertTrue(pipeline.started.wait(5))  
+        daemon.trigger()  
+        daemon.trigger()  
+        
+        pipeline.release.set()  
+        self.assertTrue(wait_until(lambda: daemon.status()['runs'] == 2))  
+        daemon.stop(timeout=5)  
+        
+        self.assertEqual(pipeline.calls, 2)  
+        self.assertEqual(daemon.status()['skipped'], 0)  
+
+    def test_run_skipped_when_other_process_holds_lock(self):  
+        pipeline = BlockingPipeline()  
+        pipeline.release.set()  
+        daemon = PipelineDaemon(pipeline, interval=60, lock_path=self.lock_path)  
+        
+        other = RunLock(self.lock_path)  
+        self.assertTrue(other.acquire())  
+        try:  
+            daemon.trigger()  
+            daemon.stop(timeout=5)  
+        finally:  
+            other.release()  
+        
+        self.assertEqual(pipeline.calls, 0)  
+        self.assertEqual(daemon.status()['last_result'], 'skipped')  
+
+    def test_run_result_follows_sink_flags(self):  
+        self.assertEqual(PipelineDaemon._run_result({'csv': True, 'postgresql': True}), 'success')  
+        self.assertEqual(PipelineDaemon._run_result({'csv': True, 'postgresql': False}), 'partial')  
+        self.assertEqual(PipelineDaemon._run_result({'csv': False, 'postgresql': False}), 'failed')  
+        self.assertEqual(PipelineDaemon._run_result({}), 'failed')  
+        
+        pipeline = BlockingPipeline()  
+        pipeline.release.set()  
+        pipeline.run = lambda: {'csv': False, 'google_sheets': False}  
+        daemon = PipelineDaemon(pipeline, interval=60, lock_path=self.lock_path)  
+        daemon.trigger()  
+        daemon.stop(timeout=5)  
+        self.assertEqual(daemon.status()['last_result'], 'failed')  
+
+    def test_run_forever_reuses_pipeline(self):  
+        pipeline = BlockingPipeline()  
+        pipeline.release.set()  
+        daemon = PipelineDaemon(pipeline, interval=0.2, lock_path=self.lock_path)  
+        
+        daemon.run_forever(max_ticks=3)  
+        
+        self.assertEqual(pipeline.calls, 3)  
+        self.assertEqual(daemon.status()['runs'], 3)  
+
+    def test_invalid_configuration(self):  
+        with self.assertRaises(ValueError):  
+            PipelineDaemon(BlockingPipeline())  
+        with self.assertRaises(ValueError):  
+            PipelineDaemon(BlockingPipeline(), interval=60, cron='* * * * *')  
+        with self.assertRaises(ValueError):  
+            PipelineDaemon(BlockingPipeline(), interval=60, overlap='parallel')  
+
+
+if __name__ == '__main__':  
+    unittest.main()  
@@ -0,0 +1,177 @@
+import pytest  
+import pandas as pd  
+import time  
+from datetime import date  
+from unittest.mock import MagicMock  
+import sys  
+import os  
+
+# Menambahkan path agar bisa import utils  
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  
+
+from utils.schema import (  
+    PostgresSchemaManager,  
+    create_partition_sql,  
+    create_table_sql,  
+    host_timezone_sql,  
+    partition_name,  
+    to_utc,  
+    to_utc_timestamp  
+)  
+
+
+@pytest.fixture  
+def jakarta_host(monkeypatch):  
+    # Simulasikan host yang tidak berjalan di UTC (UTC+7)  
+    monkeypatch.setenv('TZ', 'Asia/Jakarta')  
+    time.tzset()  
+    to_utc_timestamp.cache_clear()  
+    yield  
+    monkeypatch.undo()  
+    time.tzset()  
+    to_utc_timestamp.cache_clear()  
+
+
+class FakeConnection:  
+    """Koneksi tiruan yang mencatat SQL dan mengembalikan hasil sesuai kata kunci"""  
+
+    def __init__(self, responses=None):  
+        self.statements = []  
+        self.responses = responses or {}  
+
+    def execute(self, statement, params=None):  
+        sql = str(statement)  
+        self.statements.append(sql)  
+        
+        result = MagicMock()  
+        result.scalar.return_value = None  
+        result.scalars.return_value.all.return_value = []  
+        for keyword, value in self.responses.items():  
+            if keyword in sql:  
+                if isinstance(value, list):  
+                    result.scalars.return_value.all.return_value = value  
+                else:  
+                    result.scalar.return_value = value  
+        return result  
+
+
+@pytest.fixture  
+def sample_dataframe():  
+    return pd.DataFrame({  
+        "Title": ["Item A", "Item B"],  
+        "Price": [160000.004, 320000.0],  
+        "Rating": [4.5, 3.8],  
+        "Colors": [3.0, 2.0],  
+        "Size": ["M", "L"],  
+        "Gender": ["Men", "Women"],  
+        "Timestamp": ["2025-05-10T10:00:00.000000+00:00", "2025-05-11T23:30:00.000000+00:00"],  
+        "timestamp": ["2025-05-10T10:00:00", "2025-05-11T23:30:00"]  
+    })  
+
+
+class TestSchemaFunctions:  
+    def test_partition_naming_and_bounds(self):  
+        assert partition_name('fashion_products', date(2025, 5, 10)) == 'fashion_products_p20250510'  
+        
+        sql = create_partition_sql('fashion_products', date(2025, 5, 10))  
+        assert 'PARTITION OF fashion_products' in sql  
+        assert "FROM ('2025-05-10 00:00:00+00') TO ('2025-05-11 00:00:00+00')" in sql  
+
+    def test_create_table_is_typed_and_partitioned(self):  
+        sql = create_table_sql('fashion_products')  
+        assert '"Price" NUMERIC(14, 2)' in sql  
+        assert '"Timestamp" TIMESTAMPTZ' in sql  
+        assert 'PRIMARY KEY ("id", "Timestamp")' in sql  
+        assert 'PARTITION BY RANGE ("Timestamp")' in sql  
+
+    def test_invalid_table_name(self):  
+        with pytest.raises(ValueError):  
+            PostgresSchemaManager('products; DROP TABLE x')  
+
+    def test_prepare_frame(self, sample_dataframe):  
+        prepared = PostgresSchemaManager.prepare_frame(sample_dataframe)  
+        
+        assert list(prepared.columns) == ['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender', 'Timestamp']  
+        assert prepared['Colors'].dtype.kind == 'i'  
+        assert prepared.iloc[0]['Price'] == 160000.0  
+        assert str(prepared['Timestamp'].dt.tz) == 'UTC'  
+
+    def test_naive_timestamps_are_host_local_time(self, sample_dataframe, jakarta_host):  
+        naive = sample_dataframe.assign(Timestamp=["2025-05-10T10:00:00", "2025-05-11T23:30:00"])  
+        prepared = PostgresSchemaManager.prepare_frame(naive)  
+        
+        # 2025-05-11 23:30 WIB = 16:30 UTC, 2025-05-10 10:00 WIB = 03:00 UTC  
+        assert prepared.iloc[0]['Timestamp'] == pd.Timestamp('2025-05-10T03:00:00', tz='UTC')  
+        assert prepared.iloc[1]['Timestamp'] == pd.Timestamp('2025-05-11T16:30:00', tz='UTC')  
+        
+        # Nilai dengan offset eksplisit tidak berubah maknanya  
+        explicit = to_utc(pd.Series(['2025-05-11T23:30:00+00:00']))  
+        assert explicit.iloc[0] == pd.Timestamp('2025-05-11T23:30:00', tz='UTC')  
+        
+        assert host_timezone_sql() == "SET LOCAL TIME ZONE 'Asia/Jakarta'"  
+
+    def test_partition_day_follows_utc_instant(self, jakarta_host):  
+        conn = FakeConnection()  
+        
+        # 06:00 WIB tanggal 12 masih tanggal 11 dalam UTC  
+        created = PostgresSchemaManager().ensure_partitions(conn, pd.Series(['2025-05-12T06:00:00']))  
+        
+        assert created == ['fashion_products_p20250511']  
+
+    def test_ensure_partitions(self, sample_dataframe):  
+        conn = FakeConnection()  
+        manager = PostgresSchemaManager()  
+        
+        created = manager.ensure_partitions(conn, sample_dataframe['Timestamp'])  
+        
+        assert created == ['fashion_products_p20250510', 'fashion_products_p20250511']  
+        assert len(conn.statements) == 2  
+
+    def test_migrate_new_table(self):  
+        conn = FakeConnection()  
+        manager = PostgresSchemaManager()  
+        
+        version = manager.migrate(conn)  
+        
+        assert version == manager.latest_version  
+        assert not any('RENAME TO' in sql for sql in conn.statements)  
+        assert any('PARTITION BY RANGE' in sql for sql in conn.statements)  
+        assert any('ix_fashion_products_gender_size_price' in sql for sql in conn.statements)  
+
+    def test_migrate_legacy_table(self):  
+        conn = FakeConnection({  
+            'SELECT relkind': 'r',  
+            'SELECT DISTINCT': [date(2025, 5, 10)]  
+        })  
+        manager = PostgresSchemaManager()  
+        
+        manager.migrate(conn)  
+        
+        joined = '\n'.join(conn.statements)  
+        assert conn.statements[0] == host_timezone_sql()  
+        assert 'ALTER TABLE fashion_products RENAME TO fashion_products_legacy' in joined  
+        assert 'fashion_products_p20250510' in joined  
+        assert 'DROP TABLE fashion_products_legacy' in joined  
+
+    def test_migrate_skips_applied_versions(self):  
+        conn = FakeConnection({'SELECT version': 1})  
+        manager = PostgresSchemaManager()  
+        
+        version = manager.migrate(conn)  
+        
+        assert version == 1  
+        assert not any('PARTITION BY RANGE' in sql for sql in conn.statements)  
+
+    def test_drop_partitions_before(self):  
+        conn = FakeConnection({  
+            'pg_inherits': [  
+                'fashion_products_p20250508',  
+                'fashion_products_p20250510',  
+                'fashion_products_p20250509'  
+            ]  
+        })  
+        manager = PostgresSchemaManager()  
+        
+        dropped = manager.drop_partitions_before(conn, date(2025, 5, 10))  
+        
+        assert dropped == ['fashion_products_p20250508', 'fashion_products_p20250509']  
@@ -1,6 +1,7 @@
 import sys  
 import os  
 import unittest  
+import warnings  
 import pandas as pd  
 import numpy as np  
 from unittest.mock import patch  
@@ -80,5 +81,66 @@ class TestTransformFunctions(unittest.TestCase):
         # Validasi jumlah warna  
         self.assertTrue(all(transformed_data['Colors'] > 0))  
 
+    def test_parallel_transform_matches_single_process(self):  
+        # Data cukup besar dengan duplikat yang melintasi batas partisi  
+        large_data = pd.concat([self.sample_fashion_data] * 40, ignore_index=True)  
+        large_data.loc[len(large_data)] = ['Trendy Shirt', '$50.25', '4.5/5', '3 Colors', 'Size: m', 'Gender: male']  
+        
+        with patch('utils.transform.pd.Timestamp.now', return_value=pd.Timestamp('2025-02-10T13:54:32')):  
+            expected = DataTransformer().transform(large_data)  
+            result = DataTransformer(workers=4, min_rows_per_worker=10).transform(large_data)  
+        
+        self.assertEqual(len(expected), 2)  
+        pd.testing.assert_frame_equal(result, expected)  
+        
+        # Satu partisi berisi baris yang seluruhnya tidak valid  
+        good_rows = pd.DataFrame({  
+            'Title': [f'Shirt {i}' for i in range(10)],  
+            'Price': ['$50.25'] * 10,  
+            'Rating': ['4.5/5'] * 10,  
+            'Colors': ['3 Colors'] * 10,  
+            'Size': ['Size: M'] * 10,  
+            'Gender': ['Gender: Men'] * 10  
+        })  
+        bad_rows = good_rows.assign(Price='Unavailable', Rating='Invalid Rating', Colors='No Colors')  
+        mixed_data = pd.concat([good_rows, bad_rows], ignore_index=True)  
+        
+        with patch('utils.transform.pd.Timestamp.now', return_value=pd.Timestamp('2025-02-10T13:54:32')):  
+            expected = DataTransformer().transform(mixed_data)  
+            with warnings.catch_warnings():  
+                warnings.simplefilter('error', FutureWarning)  
+                result = DataTransformer(workers=2, min_rows_per_worker=5).transform(mixed_data)  
+        
+        self.assertEqual(len(expected), 10)  
+        self.assertEqual(result['Colors'].dtype, np.int64)  
+        pd.testing.assert_frame_equal(result, expected)  
+
+    def test_parallel_transform_falls_back_for_small_input(self):  
+        transformer = DataTransformer(workers=4)  
+        
+        with patch.object(DataTransformer, '_clean_parallel') as mock_parallel:  
+            result = transformer.transform(self.sample_fashion_data)  
+        
+        mock_parallel.assert_not_called()  
+        self.assertEqual(len(result), 2)  
+
+    def test_near_duplicate_titles_removed_when_enabled(self):  
+        data = pd.concat([self.sample_fashion_data, pd.DataFrame({  
+            'Title': ['trendy shirt!', 'Trendy  Shirt', 'Trendy Shirt'],  
+            'Price': ['$50.25', '$50.25', '$50.25'],  
+            'Rating': ['4.5/5', '4.4/5', '4.5/5'],  
+            'Colors': ['3 Colors', '3 Colors', '3 Colors'],  
+            'Size': ['Size: M', 'Size: M', 'Size: S'],  
+            'Gender': ['Gender: Men', 'Gender: Men', 'Gender: Men']  
+        })], ignore_index=True)  
+        
+        # Default hanya menghapus duplikat persis  
+        self.assertEqual(len(DataTransformer().transform(data)), 5)  
+        
+        # Variasi judul dengan Size/Gender sama digabung, Size berbeda tetap ada  
+        result = DataTransformer(near_duplicate_threshold=0.9).transform(data)  
+        self.assertEqual(list(result['Title']), ['Trendy Shirt', 'Stylish Jacket', 'Trendy Shirt'])  
+        self.assertEqual(list(result['Size']), ['M', 'L', 'S'])  
+
 if __name__ == '__main__':  
     unittest.main() 
\ No newline at end of file
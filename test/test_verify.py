@@ -0,0 +1,173 @@
+import pytest  
+import pandas as pd  
+from unittest.mock import patch, MagicMock  
+import sys  
+import os  
+
+# Menambahkan path agar bisa import utils  
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  
+
+from utils.load import DataLoader, load_data  
+from utils.verify import BatchDigest, ConsistencyVerifier, canonical_rows, row_hash  
+
+
+@pytest.fixture  
+def sample_dataframe():  
+    return pd.DataFrame({  
+        'Title': ['Shirt A', 'Pants B', 'Jacket C'],  
+        'Price': [800000.0, 600000.0, 1200000.5],  
+        'Rating': [4.5, 4.0, 3.9],  
+        'Colors': [3, 2, 5],  
+        'Size': ['M', 'L', 'XL'],  
+        'Gender': ['Men', 'Women', 'Unisex'],  
+        'Timestamp': ['2025-05-10T10:00:00+00:00', '2025-05-10T10:00:00+00:00', '2025-05-11T10:00:00+00:00']  
+    })  
+
+
+def server_aggregates(df):  
+    # Meniru hasil query agregat PostgreSQL: (partition, rows, sum(bigint))  
+    frame = pd.DataFrame({  
+        'partition': pd.to_datetime(df['Timestamp'], utc=True).dt.strftime('%Y-%m-%d'),  
+        'hash': canonical_rows(df).map(row_hash)  
+    })  
+    return [(partition, len(group), sum(group['hash'])) for partition, group in frame.groupby('partition')]  
+
+
+class TestVerifyFunctions:  
+    def test_canonical_row_format(self, sample_dataframe):  
+        rows = canonical_rows(sample_dataframe)  
+        
+        assert rows.iloc[0] == 'Shirt A|800000.00|4.50|3|M|Men|2025-05-10T10:00:00.000000'  
+        assert rows.iloc[2] == 'Jacket C|1200000.50|3.90|5|XL|Unisex|2025-05-11T10:00:00.000000'  
+
+    def test_digest_is_order_independent(self, sample_dataframe):  
+        digest = BatchDigest.from_frame(sample_dataframe)  
+        shuffled = BatchDigest.from_frame(sample_dataframe.iloc[::-1])  
+        
+        assert digest.partitions == shuffled.partitions  
+        assert digest.partitions['2025-05-10']['rows'] == 2  
+        assert digest.partitions['2025-05-11']['rows'] == 1  
+        assert digest.total_rows == 3  
+
+    def test_changed_row_narrows_to_partition(self, sample_dataframe):  
+        digest = BatchDigest.from_frame(sample_dataframe)  
+        changed = sample_dataframe.copy()  
+        changed.loc[2, 'Price'] = 1100000.0  
+        
+        assert digest.mismatched_partitions(BatchDigest.from_frame(changed)) == ['2025-05-11']  
+
+    def test_server_aggregates_match_local_digest(self, sample_dataframe):  
+        digest = BatchDigest.from_frame(sample_dataframe)  
+        
+        mock_engine = MagicMock()  
+        mock_conn = mock_engine.connect.return_value.__enter__.return_value  
+        mock_conn.execute.return_value.all.return_value = server_aggregates(sample_dataframe)  
+        
+        report = ConsistencyVerifier().verify_postgresql(digest, mock_engine, 'fashion_products')  
+        
+        assert report['ok'] is True  
+        assert report['rows'] == 3  
+        
+        # Hanya baris batch ini (berdasarkan Timestamp run) yang diagregasi  
+        params = mock_conn.execute.call_args[0][1]  
+        assert len(params['timestamps']) == 2  
+
+    def test_server_missing_rows_reported(self, sample_dataframe):  
+        digest = BatchDigest.from_frame(sample_dataframe)  
+        
+        mock_engine = MagicMock()  
+        mock_conn = mock_engine.connect.return_value.__enter__.return_value  
+        mock_conn.execute.return_value.all.return_value = server_aggregates(sample_dataframe.iloc[:2])  
+        
+        report = ConsistencyVerifier().verify_postgresql(digest, mock_engine)  
+        
+        assert report['ok'] is False  
+        assert report['mismatched_partitions'] == ['2025-05-11']  
+
+    def test_csv_manifest_round_trip(self, sample_dataframe, tmp_path):  
+        csv_path = tmp_path / 'products.csv'  
+        loader = DataLoader(csv_path=str(csv_path))  
+        digest = BatchDigest.from_frame(sample_dataframe)  
+        
+        assert loader.save_to_csv(sample_dataframe, digest=digest) is True  
+        assert loader.verifier.verify_csv(digest, str(csv_path))['ok'] is True  
+        
+        # Digest manifest berasal dari file yang ditulis, bukan salinan digest batch  
+        manifest = loader.verifier.read_manifest('csv', str(csv_path))  
+        assert manifest['digest'] == BatchDigest.from_csv(str(csv_path)).to_dict()  
+        assert manifest['digest']['partitions'] == digest.partitions  
+        
+        # File yang diubah setelah ditulis di-hash ulang; hanya partisinya yang ditandai  
+        with open(csv_path, 'a') as f:  
+            f.write('Extra,1,1,1,S,Men,2025-05-10T10:00:00+00:00\n')  
+        report = loader.verifier.verify_csv(digest, str(csv_path))  
+        assert report['ok'] is False  
+        assert report['reason'] == 'isi partisi berbeda'  
+        assert report['mismatched_partitions'] == ['2025-05-10']  
+
+    def test_csv_serialization_is_verified(self, sample_dataframe, tmp_path):  
+        csv_path = tmp_path / 'products.csv'  
+        loader = DataLoader(csv_path=str(csv_path))  
+        digest = BatchDigest.from_frame(sample_dataframe)  
+        
+        # Isi file yang berbeda dari batch tidak lolos verifikasi walaupun  
+        # file belum disentuh sejak ditulis  
+        written = sample_dataframe.copy()  
+        written.loc[0, 'Title'] = 'Shirt A (copy)'  
+        assert loader.save_to_csv(written, digest=digest) is True  
+        
+        report = loader.verifier.verify_csv(digest, str(csv_path))  
+        assert report['ok'] is False  
+        assert report['mismatched_partitions'] == ['2025-05-10']  
+        
+        # Tanpa manifest, isi file tetap bisa diperiksa  
+        os.remove(loader.verifier.manifest_path('csv', str(csv_path)))  
+        assert loader.verifier.verify_csv(BatchDigest.from_frame(written), str(csv_path))['ok'] is True  
+
+    def test_stale_manifest_detected(self, sample_dataframe, tmp_path):  
+        loader = DataLoader(csv_path=str(tmp_path / 'products.csv'))  
+        loader.save_to_csv(sample_dataframe.iloc[:2], digest=BatchDigest.from_frame(sample_dataframe.iloc[:2]))  
+        
+        # Batch baru tidak tertulis, manifest masih milik batch sebelumnya  
+        report = loader.verifier.verify_csv(BatchDigest.from_frame(sample_dataframe), str(tmp_path / 'products.csv'))  
+        assert report['ok'] is False  
+        assert report['mismatched_partitions'] == ['2025-05-11']  
+
+    @patch('googleapiclient.discovery.build')  
+    @patch('google.oauth2.service_account.Credentials.from_service_account_file')  
+    def test_google_sheets_manifest(self, mock_credentials, mock_build, sample_dataframe, tmp_path):  
+        credentials_path = tmp_path / 'credentials.json'  
+        credentials_path.write_text('{}')  
+        loader = DataLoader(csv_path=str(tmp_path / 'products.csv'), google_credentials=str(credentials_path))  
+        
+        update = mock_build.return_value.spreadsheets.return_value.values.return_value.update  
+        update.return_value.execute.return_value = {'updatedRows': 4}  
+        
+        digest = BatchDigest.from_frame(sample_dataframe)  
+        assert loader.save_to_google_sheets(sample_dataframe, 'sheet-id', 'Sheet1!A1', digest=digest) is True  
+        assert loader.verifier.verify_google_sheets(digest, 'sheet-id', 'Sheet1!A1')['ok'] is True  
+        
+        # Digest manifest dihitung dari nilai yang dikirim, bukan disalin dari digest batch  
+        changed = sample_dataframe.copy()  
+        changed.loc[2, 'Price'] = 1100000.0  
+        loader.save_to_google_sheets(changed, 'sheet-id', 'Sheet1!A1', digest=digest)  
+        report = loader.verifier.verify_google_sheets(digest, 'sheet-id', 'Sheet1!A1')  
+        assert report['ok'] is False  
+        assert report['mismatched_partitions'] == ['2025-05-11']  
+        
+        # API yang melaporkan baris lebih sedikit menandai seluruh batch  
+        update.return_value.execute.return_value = {'updatedRows': 2}  
+        loader.save_to_google_sheets(sample_dataframe, 'sheet-id', 'Sheet1!A1', digest=digest)  
+        report = loader.verifier.verify_google_sheets(digest, 'sheet-id', 'Sheet1!A1')  
+        assert report['ok'] is False  
+        assert report['mismatched_partitions'] == ['2025-05-10', '2025-05-11']  
+
+    def test_load_data_with_verification(self, sample_dataframe, tmp_path):  
+        loader = DataLoader(csv_path=str(tmp_path / 'products.csv'))  
+        
+        result = load_data(sample_dataframe, csv_path=str(tmp_path / 'products.csv'), loader=loader, verify=True)  
+        
+        assert result['csv'] is True  
+        assert result['verify_csv'] is True  
+        assert loader.last_verification['csv']['mismatched_partitions'] == []  
+        assert 'verify_postgresql' not in result  
@@ -0,0 +1,188 @@
+import json  
+import logging  
+import os  
+from typing import Dict, Optional  
+
+import numpy as np  
+import pandas as pd  
+
+# Konfigurasi Logging  
+logging.basicConfig(  
+    level=logging.INFO,  
+    format='%(asctime)s - %(levelname)s: %(message)s'  
+)  
+logger = logging.getLogger(__name__)  
+
+CONTENT_COLUMNS = ['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender']  
+
+# Histogram rating: [0-1), [1-2), [2-3), [3-4), [4-5]  
+RATING_BINS = 5  
+HISTOGRAM_COLUMNS = [f'Rating_{i}_{i + 1}' for i in range(RATING_BINS)]  
+
+ROLLUP_COLUMNS = [  
+    'Gender', 'Size', 'Count',  
+    'AvgPrice', 'MinPrice', 'MaxPrice',  
+    'AvgRating', 'MinRating', 'MaxRating'  
+] + HISTOGRAM_COLUMNS  
+
+
+def _rating_bins(ratings: pd.Series) -> pd.Series:  
+    return np.clip(np.floor(ratings), 0, RATING_BINS - 1).astype(int)  
+
+
+def _empty_group() -> Dict:  
+    return {  
+        'count': 0,  
+        'price_sum': 0.0,  
+        'rating_sum': 0.0,  
+        'price_min': None,  
+        'price_max': None,  
+        'rating_min': None,  
+        'rating_max': None,  
+        'rating_hist': [0] * RATING_BINS  
+    }  
+
+
+def _merge_extreme(current: Optional[float], value: float, pick) -> float:  
+    return value if current is None else pick(current, value)  
+
+
+class RollupAggregator:  
+    """  
+    Menjaga agregat per Gender x Size (count, sum, min/max dan histogram rating)  
+    atas seluruh batch yang pernah dimuat, sama seperti tabel PostgreSQL yang  
+    menyimpan setiap run. State berisi satu entri per grup dan diperbarui  
+    secara aditif, sehingga tabel yang sudah dimuat tidak perlu dipindai ulang  
+    """  
+
+    def __init__(self, state_path: Optional[str] = None, replace: bool = False):  
+        if state_path is None:  
+            state_path = os.path.join(os.getcwd(), 'rollup_state.json')  
+        
+        self.state_path = os.path.abspath(state_path)  
+        
+        # replace=False: setiap batch ditambahkan ke agregat riwayat (dipersist)  
+        # replace=True: rollup hanya menggambarkan batch terakhir (seperti products.csv),  
+        # jadi tidak ada state yang perlu dibaca atau disimpan  
+        self.replace = replace  
+        self.state = {'groups': {}} if replace else self._load_state()  
+
+    def _load_state(self) -> Dict:  
+        try:  
+            if os.path.exists(self.state_path):  
+                with open(self.state_path, 'r') as f:  
+                    state = json.load(f)  
+                # State versi lama menyimpan hash per baris; tidak dipakai lagi  
+                state.pop('rows', None)  
+                return state  
+        except Exception as e:  
+            logger.warning(f"State rollup tidak dapat dibaca, mulai dari awal: {e}")  
+        return {'groups': {}}  
+
+    def _save_state(self) -> None:  
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)  
+        tmp_path = f"{self.state_path}.tmp"  
+        with open(tmp_path, 'w') as f:  
+            json.dump(self.state, f)  
+        os.replace(tmp_path, self.state_path)  
+
+    @staticmethod  
+    def _group_key(gender: str, size: str) -> str:  
+        return f"{gender}|{size}"  
+
+    def _batch_groups(self, df: pd.DataFrame) -> Dict[str, Dict]:  
+        # Kontribusi batch per grup dihitung sekali dengan groupby tervektorisasi  
+        data = df[CONTENT_COLUMNS].dropna().astype({'Price': float, 'Rating': float})  
+        if data.empty:  
+            return {}  
+        
+        grouped = data.groupby(['Gender', 'Size'], sort=False)  
+        stats = grouped.agg(  
+            count=('Price', 'size'),  
+            price_sum=('Price', 'sum'),  
+            rating_sum=('Rating', 'sum'),  
+            price_min=('Price', 'min'),  
+            price_max=('Price', 'max'),  
+            rating_min=('Rating', 'min'),  
+            rating_max=('Rating', 'max')  
+        )  
+        histogram = (  
+            data.groupby(['Gender', 'Size', _rating_bins(data['Rating'])], sort=False)  
+            .size()  
+            .unstack(fill_value=0)  
+            .reindex(columns=range(RATING_BINS), fill_value=0)  
+            .reindex(stats.index)  
+        )  
+        
+        groups = {}  
+        for (gender, size), row, hist in zip(stats.index, stats.itertuples(index=False), histogram.to_numpy()):  
+            groups[self._group_key(gender, size)] = {  
+                'count': int(row.count),  
+                'price_sum': float(row.price_sum),  
+                'rating_sum': float(row.rating_sum),  
+                'price_min': float(row.price_min),  
+                'price_max': float(row.price_max),  
+                'rating_min': float(row.rating_min),  
+                'rating_max': float(row.rating_max),  
+                'rating_hist': [int(value) for value in hist]  
+            }  
+        return groups  
+
+    @staticmethod  
+    def _add(group: Dict, delta: Dict) -> None:  
+        # Count, sum dan histogram bersifat aditif; min/max cukup dibandingkan  
+        group['count'] += delta['count']  
+        group['price_sum'] += delta['price_sum']  
+        group['rating_sum'] += delta['rating_sum']  
+        group['rating_hist'] = [a + b for a, b in zip(group['rating_hist'], delta['rating_hist'])]  
+        group['price_min'] = _merge_extreme(group['price_min'], delta['price_min'], min)  
+        group['price_max'] = _merge_extreme(group['price_max'], delta['price_max'], max)  
+        group['rating_min'] = _merge_extreme(group['rating_min'], delta['rating_min'], min)  
+        group['rating_max'] = _merge_extreme(group['rating_max'], delta['rating_max'], max)  
+
+    def update(self, df: pd.DataFrame) -> pd.DataFrame:  
+        try:  
+            if df is None or df.empty:  
+                logger.warning("DataFrame kosong atau None")  
+                return self.to_frame()  
+            
+            groups = self.state.setdefault('groups', {})  
+            batch = self._batch_groups(df)  
+            
+            if self.replace:  
+                # Batch adalah snapshot lengkap: agregatnya langsung menjadi rollup  
+                self.state['groups'] = batch  
+            else:  
+                for group_key, delta in batch.items():  
+                    self._add(groups.setdefault(group_key, _empty_group()), delta)  
+                self._save_state()  
+            
+            logger.info(f"Rollup diperbarui untuk {len(batch)} grup Gender x Size")  
+            return self.to_frame()  
+        
+        except Exception as e:  
+            logger.error(f"Gagal memperbarui rollup: {e}")  
+            return pd.DataFrame(columns=ROLLUP_COLUMNS)  
+
+    def to_frame(self) -> pd.DataFrame:  
+        records = []  
+        for group_key, group in sorted(self.state.get('groups', {}).items()):  
+            if group['count'] <= 0:  
+                continue  
+            
+            gender, size = group_key.split('|', 1)  
+            record = {  
+                'Gender': gender,  
+                'Size': size,  
+                'Count': group['count'],  
+                'AvgPrice': round(group['price_sum'] / group['count'], 2),  
+                'MinPrice': group['price_min'],  
+                'MaxPrice': group['price_max'],  
+                'AvgRating': round(group['rating_sum'] / group['count'], 2),  
+                'MinRating': group['rating_min'],  
+                'MaxRating': group['rating_max']  
+            }  
+            record.update(zip(HISTOGRAM_COLUMNS, group['rating_hist']))  
+            records.append(record)  
+        
+        return pd.DataFrame(records, columns=ROLLUP_COLUMNS)  
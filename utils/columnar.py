@@ -0,0 +1,165 @@
+import logging  
+from typing import Callable, Dict, List, Optional, Sequence  
+
+import numpy as np  
+import pandas as pd  
+
+# Konfigurasi Logging  
+logging.basicConfig(  
+    level=logging.INFO,  
+    format='%(asctime)s - %(levelname)s: %(message)s'  
+)  
+logger = logging.getLogger(__name__)  
+
+# Urutan dan tipe kolom hasil ekstraksi, diisi oleh DataExtractor._parse_page  
+RAW_COLUMNS = ['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender', 'timestamp']  
+REQUIRED_COLUMNS = ['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender']  
+
+_ROW_NUMBER = '__row'  
+
+
+def require_pyarrow():  
+    # pyarrow opsional: hanya dibutuhkan saat ETLPipeline memakai interchange='arrow'  
+    try:  
+        import pyarrow  
+        import pyarrow.compute  
+    except ImportError as e:  
+        raise ImportError("Mode Arrow membutuhkan paket pyarrow (pip install pyarrow)") from e  
+    return pyarrow, pyarrow.compute  
+
+
+def raw_schema():  
+    pa, _ = require_pyarrow()  
+    return pa.schema([  
+        ('Title', pa.string()),  
+        ('Price', pa.float64()),  
+        ('Rating', pa.float64()),  
+        ('Colors', pa.int64()),  
+        ('Size', pa.string()),  
+        ('Gender', pa.string()),  
+        ('timestamp', pa.string())  
+    ])  
+
+
+def table_from_columns(columns: Dict[str, List], schema=None):  
+    # Kolom dibangun langsung dari list per kolom tanpa melewati DataFrame  
+    pa, _ = require_pyarrow()  
+    schema = schema or raw_schema()  
+    return pa.Table.from_arrays(  
+        [pa.array(columns.get(field.name, []), type=field.type) for field in schema],  
+        schema=schema  
+    )  
+
+
+def _numbers(array, pattern: str, target_type):  
+    pa, pc = require_pyarrow()  
+    
+    # Kolom teks ('$50.25', '4.5/5', '3 Colors') diekstrak dengan regex seperti  
+    # versi pandas; kolom numerik cukup di-cast tanpa menyentuh nilai per baris  
+    if pa.types.is_string(array.type) or pa.types.is_large_string(array.type):  
+        matched = pc.extract_regex(array, pattern=pattern)  
+        return pc.cast(pc.struct_field(matched, [0]), target_type)  
+    return pc.cast(array, target_type)  
+
+
+def _map_categories(array, normalize: Callable[[Optional[str]], str]):  
+    pa, pc = require_pyarrow()  
+    
+    # Normalisasi hanya dijalankan sekali per nilai unik (dictionary),  
+    # termasuk null yang diperlakukan sama seperti str(None) di versi pandas  
+    encoded = pc.dictionary_encode(array, null_encoding='encode').combine_chunks()  
+    dictionary = pa.array(  
+        [normalize(value) for value in encoded.dictionary.to_pylist()],  
+        type=pa.string()  
+    )  
+    return dictionary.take(encoded.indices)  
+
+
+def clean_table(  
+    table,  
+    normalize_size: Callable[[Optional[str]], str],  
+    normalize_gender: Callable[[Optional[str]], str],  
+    price_rate: float = 16000  
+):  
+    pa, pc = require_pyarrow()  
+    
+    price_usd = _numbers(table.column('Price'), r'\$?(?P<value>\d+(?:\.\d+)?)', pa.float64())  
+    columns = {  
+        'Title': table.column('Title'),  
+        'Price': pc.round(pc.multiply(price_usd, price_rate), 2),  
+        'Rating': _numbers(table.column('Rating'), r'(?P<value>\d+(?:\.\d+)?)', pa.float64()),  
+        'Colors': _numbers(table.column('Colors'), r'(?P<value>\d+)', pa.int64()),  
+        'Size': _map_categories(table.column('Size'), normalize_size),  
+        'Gender': _map_categories(table.column('Gender'), normalize_gender)  
+    }  
+    
+    # Kolom lain (misalnya timestamp ekstraksi) dibawa apa adanya  
+    for name in table.column_names:  
+        columns.setdefault(name, table.column(name))  
+    cleaned = pa.table({name: columns[name] for name in table.column_names})  
+    
+    # Hapus baris dengan data tidak valid  
+    valid = pc.is_valid(cleaned.column(REQUIRED_COLUMNS[0]))  
+    for name in REQUIRED_COLUMNS[1:]:  
+        valid = pc.and_(valid, pc.is_valid(cleaned.column(name)))  
+    return cleaned.filter(valid)  
+
+
+def drop_duplicate_rows(table, columns: Optional[Sequence[str]] = None):  
+    pa, _ = require_pyarrow()  
+    
+    if table.num_rows == 0:  
+        return table  
+    
+    # Seperti drop_duplicates(keep='first'): ambil nomor baris terkecil tiap grup  
+    columns = list(columns or table.column_names)  
+    numbered = table.append_column(_ROW_NUMBER, pa.array(np.arange(table.num_rows, dtype=np.int64)))  
+    firsts = numbered.group_by(columns, use_threads=False).aggregate([(_ROW_NUMBER, 'min')])  
+    keep = np.sort(firsts.column(f"{_ROW_NUMBER}_min").to_numpy())  
+    return table.take(pa.array(keep))  
+
+
+def _utc_timestamps(timestamps):  
+    pa, pc = require_pyarrow()  
+    utc_type = pa.timestamp('us', tz='UTC')  
+    
+    if getattr(timestamps.type, 'tz', None) is not None:  
+        return pc.cast(timestamps, utc_type)  
+    
+    if pa.types.is_string(timestamps.type) or pa.types.is_large_string(timestamps.type):  
+        # Parser ISO 8601 Arrow membaca offset, 'T' dan pecahan detik langsung dari buffer  
+        try:  
+            return pc.cast(timestamps, utc_type)  
+        except pa.ArrowInvalid:  
+            pass  
+    
+    # Tanpa zona waktu berarti waktu lokal host; dikonversi sekali per nilai unik  
+    from utils.schema import to_utc  
+    unique = pc.unique(timestamps)  
+    converted = pa.array(to_utc(pd.Series(unique.to_pylist())), type=utc_type)  
+    return pc.take(converted, pc.index_in(timestamps, value_set=unique))  
+
+
+def prepare_table(table, columns: Sequence[str]):  
+    # Padanan PostgresSchemaManager.prepare_frame untuk tabel Arrow  
+    pa, pc = require_pyarrow()  
+    
+    prepared = table.select(list(columns))  
+    types = {  
+        'Price': pa.float64(),  
+        'Rating': pa.float64(),  
+        'Colors': pa.int16()  
+    }  
+    for name, target_type in types.items():  
+        if name in prepared.column_names:  
+            index = prepared.schema.get_field_index(name)  
+            values = pc.cast(prepared.column(name), target_type)  
+            if name != 'Colors':  
+                values = pc.round(values, 2)  
+            prepared = prepared.set_column(index, name, values)  
+    
+    if 'Timestamp' in prepared.column_names:  
+        index = prepared.schema.get_field_index('Timestamp')  
+        prepared = prepared.set_column(index, 'Timestamp', _utc_timestamps(prepared.column('Timestamp')))  
+    
+    return prepared  
@@ -0,0 +1,219 @@
+import logging  
+import re  
+import unicodedata  
+import zlib  
+from itertools import combinations  
+from typing import Dict, List, Optional, Sequence, Set, Tuple  
+
+import numpy as np  
+import pandas as pd  
+
+# Konfigurasi Logging  
+logging.basicConfig(  
+    level=logging.INFO,  
+    format='%(asctime)s - %(levelname)s: %(message)s'  
+)  
+logger = logging.getLogger(__name__)  
+
+# Modulus permutasi MinHash; hash shingle < 2^31 sehingga a*x + b muat di uint64  
+MERSENNE_PRIME = (1 << 31) - 1  
+BLOCK_MIX = np.uint64(0x9E3779B97F4A7C15)  
+
+
+def normalize_title(title) -> str:  
+    # Huruf kecil, tanpa aksen dan tanda baca, spasi dirapikan  
+    text = unicodedata.normalize('NFKD', str(title))  
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))  
+    text = re.sub(r'[^0-9a-z]+', ' ', text.lower())  
+    return ' '.join(text.split())  
+
+
+def shingles(text: str, size: int = 3) -> Set[str]:  
+    # Shingle karakter dengan spasi di tepi agar awal/akhir kata ikut berbobot  
+    padded = f" {text} "  
+    if len(padded) <= size:  
+        return {padded}  
+    return {padded[i:i + size] for i in range(len(padded) - size + 1)}  
+
+
+def lsh_parameters(threshold: float, num_perm: int) -> Tuple[int, int]:  
+    # Pilih (bands, rows) dengan titik belok kurva S, (1/b)^(1/r), tepat di  
+    # bawah threshold: recall diutamakan, presisi dijaga oleh verifikasi kandidat  
+    options = []  
+    for rows in range(1, num_perm + 1):  
+        if num_perm % rows == 0:  
+            bands = num_perm // rows  
+            options.append(((1.0 / bands) ** (1.0 / rows), bands, rows))  
+    
+    below = [option for option in options if option[0] <= threshold]  
+    _, bands, rows = max(below) if below else min(options)  
+    return bands, rows  
+
+
+class _UnionFind:  
+    def __init__(self, size: int):  
+        self.parent = list(range(size))  
+
+    def find(self, item: int) -> int:  
+        parent = self.parent  
+        while parent[item] != item:  
+            parent[item] = parent[parent[item]]  
+            item = parent[item]  
+        return item  
+
+    def union(self, a: int, b: int) -> None:  
+        root_a, root_b = self.find(a), self.find(b)  
+        if root_a != root_b:  
+            # Akar selalu baris paling awal sehingga baris pertama yang dipertahankan  
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)  
+
+
+class NearDuplicateDetector:  
+    """  
+    Mendeteksi produk yang hampir sama (judul sedikit berbeda, halaman atau  
+    mirror lain) tanpa membandingkan semua pasangan: judul dinormalisasi,  
+    diringkas dengan MinHash, lalu dikelompokkan per band LSH di dalam blok  
+    atribut (Size, Gender). Hanya pasangan kandidat dari bucket yang sama  
+    yang diverifikasi dengan Jaccard sebenarnya  
+    """  
+
+    def __init__(  
+        self,  
+        threshold: float = 0.8,  
+        num_perm: int = 64,  
+        shingle_size: int = 3,  
+        block_columns: Sequence[str] = ('Size', 'Gender'),  
+        price_tolerance: Optional[float] = 0.01,  
+        max_bucket_size: int = 64,  
+        seed: int = 42  
+    ):  
+        if not 0 < threshold <= 1:  
+            raise ValueError("threshold harus di antara 0 dan 1")  
+        if num_perm < 1:  
+            raise ValueError("num_perm harus lebih besar dari 0")  
+        
+        self.threshold = threshold  
+        self.num_perm = int(num_perm)  
+        self.shingle_size = int(shingle_size)  
+        self.block_columns = list(block_columns)  
+        self.price_tolerance = price_tolerance  
+        self.max_bucket_size = max(2, int(max_bucket_size))  
+        self.bands, self.rows = lsh_parameters(threshold, self.num_perm)  
+        
+        rng = np.random.default_rng(seed)  
+        self._a = rng.integers(1, MERSENNE_PRIME, size=self.num_perm, dtype=np.uint64)  
+        self._b = rng.integers(0, MERSENNE_PRIME, size=self.num_perm, dtype=np.uint64)  
+        self._band_mix = rng.integers(1, 1 << 62, size=self.rows, dtype=np.uint64) | np.uint64(1)  
+        
+        self.last_stats: Dict[str, int] = {}  
+
+    def signatures(self, shingle_sets: Sequence[Set[str]], chunk_size: int = 1024) -> np.ndarray:  
+        signatures = np.empty((len(shingle_sets), self.num_perm), dtype=np.uint64)  
+        
+        # Diproses per potongan agar matriks (shingle x permutasi) tetap kecil  
+        for start in range(0, len(shingle_sets), chunk_size):  
+            chunk = shingle_sets[start:start + chunk_size]  
+            counts = np.fromiter((len(items) for items in chunk), dtype=np.int64, count=len(chunk))  
+            hashes = np.fromiter(  
+                (zlib.crc32(item.encode('utf-8')) for items in chunk for item in items),  
+                dtype=np.uint64,  
+                count=int(counts.sum())  
+            ) % np.uint64(MERSENNE_PRIME)  
+            
+            permuted = (hashes[:, None] * self._a + self._b) % np.uint64(MERSENNE_PRIME)  
+            offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))  
+            signatures[start:start + len(chunk)] = np.minimum.reduceat(permuted, offsets, axis=0)  
+        
+        return signatures  
+
+    def _block_codes(self, df: pd.DataFrame) -> np.ndarray:  
+        columns = [col for col in self.block_columns if col in df.columns]  
+        if not columns:  
+            return np.zeros(len(df), dtype=np.int64)  
+        return df.groupby(columns, sort=False, dropna=False).ngroup().to_numpy(dtype=np.int64)  
+
+    def _candidate_pairs(self, signatures: np.ndarray, block_codes: np.ndarray) -> np.ndarray:  
+        block_keys = block_codes.astype(np.uint64) * BLOCK_MIX  
+        pairs: List[np.ndarray] = []  
+        
+        for band in range(self.bands):  
+            part = signatures[:, band * self.rows:(band + 1) * self.rows]  
+            keys = (part * self._band_mix).sum(axis=1, dtype=np.uint64) ^ block_keys  
+            
+            order = np.argsort(keys, kind='stable')  
+            sorted_keys = keys[order]  
+            starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])  
+            ends = np.r_[starts[1:], len(keys)]  
+            
+            for start, end in zip(starts[ends - starts > 1], ends[ends - starts > 1]):  
+                members = np.sort(order[start:end])  
+                if len(members) <= self.max_bucket_size:  
+                    pairs.append(np.array(list(combinations(members, 2)), dtype=np.int64))  
+                else:  
+                    # Bucket besar hanya dibandingkan dengan anggota pertamanya  
+                    # agar jumlah pasangan tetap linear  
+                    pairs.append(np.column_stack([np.full(len(members) - 1, members[0]), members[1:]]))  
+        
+        if not pairs:  
+            return np.empty((0, 2), dtype=np.int64)  
+        return np.unique(np.concatenate(pairs), axis=0)  
+
+    def find_clusters(self, df: pd.DataFrame) -> np.ndarray:  
+        # Label setiap baris = posisi baris pertama di kelompoknya  
+        size = len(df)  
+        if size == 0:  
+            return np.empty(0, dtype=np.int64)  
+        
+        # Judul yang sama setelah normalisasi hanya di-MinHash sekali  
+        title_codes, unique_titles = pd.factorize(df['Title'].map(normalize_title))  
+        unique_shingles = [shingles(title, self.shingle_size) for title in unique_titles]  
+        signatures = self.signatures(unique_shingles)[title_codes]  
+        block_codes = self._block_codes(df)  
+        
+        candidates = self._candidate_pairs(signatures, block_codes)  
+        left, right = candidates[:, 0], candidates[:, 1]  
+        
+        # Saring kandidat secara vektor: blok harus sama dan harga dalam toleransi  
+        keep = block_codes[left] == block_codes[right]  
+        if self.price_tolerance is not None and 'Price' in df.columns:  
+            prices = pd.to_numeric(df['Price'], errors='coerce').to_numpy(dtype=np.float64)  
+            limit = self.price_tolerance * np.maximum(np.abs(prices[left]), np.abs(prices[right]))  
+            keep &= np.abs(prices[left] - prices[right]) <= limit  
+        
+        union_find = _UnionFind(size)  
+        similarity_cache: Dict[Tuple[int, int], float] = {}  
+        matched = 0  
+        
+        for row, other in candidates[keep]:  
+            key = (min(title_codes[row], title_codes[other]), max(title_codes[row], title_codes[other]))  
+            similarity = similarity_cache.get(key)  
+            if similarity is None:  
+                first, second = unique_shingles[key[0]], unique_shingles[key[1]]  
+                similarity = len(first & second) / len(first | second)  
+                similarity_cache[key] = similarity  
+            
+            if similarity >= self.threshold:  
+                union_find.union(int(row), int(other))  
+                matched += 1  
+        
+        labels = np.fromiter((union_find.find(i) for i in range(size)), dtype=np.int64, count=size)  
+        self.last_stats = {  
+            'rows': size,  
+            'candidates': int(len(candidates)),  
+            'matches': matched,  
+            'duplicates': int(size - len(np.unique(labels)))  
+        }  
+        return labels  
+
+    def deduplicate(self, df: pd.DataFrame) -> pd.DataFrame:  
+        if df is None or df.empty:  
+            return df  
+        
+        labels = self.find_clusters(df)  
+        result = df[labels == np.arange(len(df))]  
+        
+        logger.info(  
+            f"Deduplikasi mirip: {self.last_stats['duplicates']} duplikat dihapus "  
+            f"dari {self.last_stats['rows']} baris ({self.last_stats['candidates']} pasangan kandidat)"  
+        )  
+        return result  
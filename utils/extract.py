@@ -1,12 +1,17 @@
 import logging  
 import re  
+from concurrent.futures import ThreadPoolExecutor  
 from typing import List, Dict, Optional  
 from datetime import datetime  
+from urllib.parse import urlparse  
 
 import requests  
 from bs4 import BeautifulSoup  
 import pandas as pd  
 
+from utils.columnar import RAW_COLUMNS  
+from utils.ratelimit import AdaptiveConcurrencyController, THROTTLE_STATUS_CODES  
+
 # Konfigurasi Logging  
 logging.basicConfig(  
     level=logging.INFO,   
@@ -18,10 +23,19 @@ class DataExtractor:
     def __init__(  
         self,   
         base_url: str = 'https://fashion-studio.dicoding.dev/',   
-        max_pages: int = 50  
+        max_pages: int = 50,  
+        rate_controller: Optional[AdaptiveConcurrencyController] = None,  
+        max_retries: int = 3,  
+        timeout: float = 30.0  
     ):  
         self.base_url = base_url  
         self.max_pages = max_pages  
+        self.max_retries = max(1, max_retries)  
+        self.timeout = timeout  
+        
+        # Konkurensi permintaan diatur adaptif per host berdasarkan latensi dan throttling;  
+        # jeda Retry-After tidak pernah lebih lama dari timeout permintaan  
+        self.rate_controller = rate_controller or AdaptiveConcurrencyController(max_retry_after=timeout)  
         self.session = requests.Session()  
         self.session.headers.update({  
             'User-Agent': 'Mozilla/5.0 ETL Pipeline Scraper'  
@@ -89,95 +103,143 @@ class DataExtractor:
         
         return pd.DataFrame(products)  
 
-    def scrape_products(self) -> List[Dict]:   
-        products = []  
+    def extract_arrow(self, max_items: int = 1000):  
+        """  
+        Ekstraksi yang menghasilkan tabel Arrow: kolom diisi langsung saat  
+        parsing halaman tanpa membentuk dict per produk maupun DataFrame pandas  
+        """  
+        from utils.columnar import table_from_columns  
+        
+        columns = self.scrape_columns()  
+        return table_from_columns({name: values[:max_items] for name, values in columns.items()})  
+
+    def _fetch_page(self, url: str) -> requests.Response:  
+        host = urlparse(url).netloc  
         
-        try:  
-            for page in range(1, self.max_pages + 1):  
-                try:  
-                    # Penyesuaian URL untuk halaman pertama  
-                    url = (  
-                        self.base_url if page == 1   
-                        else f'{self.base_url}page{page}'  
-                    )  
-                    
-                    response = self.session.get(url)  
-                    response.raise_for_status()  
-                    
-                    soup = BeautifulSoup(response.content, 'html.parser')  
-                    
-                    # Temukan semua kartu produk  
-                    cards = soup.select('.collection-card')  
-                    
-                    for card in cards:  
-                        try:  
-                            # Ekstraksi title  
-                            title_elem = card.select_one('.product-title')  
-                            title = self._extract_text(title_elem, 'Unknown Product')  
-                            
-                            # Ekstraksi price  
-                            price_elem = card.select_one('.price, .price-container .price')  
-                            price_text = self._extract_text(price_elem, 'Price Unavailable')  
-                            price = self._parse_price(price_text)  
-                            
-                            # Skip jika price invalid  
-                            if price is None or title == "Unknown Product":  
-                                continue  
-                            
-                            # Ekstraksi detail lainnya  
-                            details = card.select('p')  
-                            
-                            rating_text = self._extract_text(  
-                                details[0] if details and 'Rating' in details[0].text   
-                                else None  
-                            )  
-                            rating = self._extract_rating(rating_text)  
-                            
-                            colors_text = self._extract_text(  
-                                details[1] if len(details) > 1 and 'Colors' in details[1].text   
-                                else None  
-                            )  
-                            colors = self._extract_colors(colors_text)  
-                            
-                            size_text = self._extract_text(  
-                                details[2] if len(details) > 2 and 'Size:' in details[2].text  
-                                else None,   
-                                'Unknown'  
-                            )  
-                            size = size_text.replace('Size: ', '') if size_text else None  
-                            
-                            gender_text = self._extract_text(  
-                                details[3] if len(details) > 3 and 'Gender:' in details[3].text  
-                                else None,   
-                                'Unknown'  
-                            )  
-                            gender = gender_text.replace('Gender: ', '') if gender_text else None  
-                            
-                            product = {  
-                                'Title': title,  
-                                'Price': price,  
-                                'Rating': rating,  
-                                'Colors': colors,  
-                                'Size': size,  
-                                'Gender': gender,  
-                                'timestamp': datetime.now().isoformat()  
-                            }  
-                            
-                            products.append(product)  
-                        
-                        except Exception as item_error:  
-                            logger.error(f"Error processing item: {item_error}")  
+        for attempt in range(1, self.max_retries + 1):  
+            with self.rate_controller.slot(host) as slot:  
+                response = self.session.get(url, timeout=self.timeout)  
+                retry_after = (  
+                    response.headers.get('Retry-After')  
+                    if response.status_code in THROTTLE_STATUS_CODES else None  
+                )  
+                slot.record(response.status_code, retry_after)  
+            
+            # Server meminta jeda lebih lama dari yang bersedia ditunggu: halaman dilewati  
+            if slot.retry_after is not None and slot.retry_after > self.rate_controller.max_retry_after:  
+                raise requests.exceptions.RetryError(  
+                    f"Retry-After {slot.retry_after:.0f} detik melebihi batas "  
+                    f"{self.rate_controller.max_retry_after:.0f} detik untuk {url}"  
+                )  
+            
+            # 429/503: controller sudah menurunkan batas dan menahan host, lalu coba lagi  
+            if response.status_code in THROTTLE_STATUS_CODES and attempt < self.max_retries:  
+                logger.warning(f"Server membalas {response.status_code} untuk {url}, percobaan ulang {attempt}")  
+                continue  
+            
+            response.raise_for_status()  
+            return response  
+
+    def _parse_page(self, content) -> Dict[str, List]:  
+        # Nilai setiap produk langsung ditambahkan ke list per kolom (RAW_COLUMNS)  
+        columns = {name: [] for name in RAW_COLUMNS}  
+        
+        soup = BeautifulSoup(content, 'html.parser')  
+        
+        # Temukan semua kartu produk  
+        cards = soup.select('.collection-card')  
+        
+        for card in cards:  
+            try:  
+                # Ekstraksi title  
+                title_elem = card.select_one('.product-title')  
+                title = self._extract_text(title_elem, 'Unknown Product')  
+                
+                # Ekstraksi price  
+                price_elem = card.select_one('.price, .price-container .price')  
+                price_text = self._extract_text(price_elem, 'Price Unavailable')  
+                price = self._parse_price(price_text)  
                 
-                except requests.exceptions.RequestException as page_error:  
-                    logger.error(f"Error fetching page {page}: {page_error}")  
+                # Skip jika price invalid  
+                if price is None or title == "Unknown Product":  
                     continue  
+                
+                # Ekstraksi detail lainnya  
+                details = card.select('p')  
+                
+                rating_text = self._extract_text(  
+                    details[0] if details and 'Rating' in details[0].text  
+                    else None  
+                )  
+                rating = self._extract_rating(rating_text)  
+                
+                colors_text = self._extract_text(  
+                    details[1] if len(details) > 1 and 'Colors' in details[1].text  
+                    else None  
+                )  
+                colors = self._extract_colors(colors_text)  
+                
+                size_text = self._extract_text(  
+                    details[2] if len(details) > 2 and 'Size:' in details[2].text  
+                    else None,  
+                    'Unknown'  
+                )  
+                size = size_text.replace('Size: ', '') if size_text else None  
+                
+                gender_text = self._extract_text(  
+                    details[3] if len(details) > 3 and 'Gender:' in details[3].text  
+                    else None,  
+                    'Unknown'  
+                )  
+                gender = gender_text.replace('Gender: ', '') if gender_text else None  
+                
+                values = (title, price, rating, colors, size, gender, datetime.now().isoformat())  
+                for name, value in zip(RAW_COLUMNS, values):  
+                    columns[name].append(value)  
+            
+            except Exception as item_error:  
+                logger.error(f"Error processing item: {item_error}")  
+        
+        return columns  
+
+    def _scrape_page(self, page: int) -> Dict[str, List]:  
+        # Penyesuaian URL untuk halaman pertama  
+        url = (  
+            self.base_url if page == 1  
+            else f'{self.base_url}page{page}'  
+        )  
+        
+        try:  
+            response = self._fetch_page(url)  
+        except requests.exceptions.RequestException as page_error:  
+            logger.error(f"Error fetching page {page}: {page_error}")  
+            return {name: [] for name in RAW_COLUMNS}  
+        
+        return self._parse_page(response.content)  
+
+    def scrape_columns(self) -> Dict[str, List]:  
+        columns = {name: [] for name in RAW_COLUMNS}  
+        
+        try:  
+            # Halaman diambil paralel; controller menentukan berapa yang benar-benar berjalan  
+            pages = range(1, self.max_pages + 1)  
+            with ThreadPoolExecutor(max_workers=self.rate_controller.max_limit) as executor:  
+                for page_columns in executor.map(self._scrape_page, pages):  
+                    for name in RAW_COLUMNS:  
+                        columns[name].extend(page_columns[name])  
             
-            logger.info(f"Berhasil mengekstrak {len(products)} produk")  
-            return products  
+            logger.info(f"Berhasil mengekstrak {len(columns['Title'])} produk")  
+            logger.info(f"Status rate controller: {self.rate_controller.snapshot()}")  
+            return columns  
         
         except Exception as e:  
             logger.critical(f"Fatal error dalam scraping: {e}")  
-            return []  
+            return {name: [] for name in RAW_COLUMNS}  
+
+    def scrape_products(self) -> List[Dict]:  
+        # Bentuk per produk untuk jalur pandas  
+        columns = self.scrape_columns()  
+        return [dict(zip(RAW_COLUMNS, row)) for row in zip(*(columns[name] for name in RAW_COLUMNS))]  
 
 # Fungsi wrapper untuk memudahkan pemanggilan  
 def extract_data():  
@@ -0,0 +1,352 @@
+import json  
+import logging  
+import os  
+from typing import Dict, List, Optional, Union  
+
+import numpy as np  
+import pandas as pd  
+
+from utils.schema import to_utc, to_utc_timestamp  
+
+# Konfigurasi Logging  
+logging.basicConfig(  
+    level=logging.INFO,  
+    format='%(asctime)s - %(levelname)s: %(message)s'  
+)  
+logger = logging.getLogger(__name__)  
+
+# Satu record = satu titik perubahan harga/rating sebuah produk (22 byte, tanpa padding)  
+RECORD_DTYPE = np.dtype([  
+    ('product', '<u4'),  
+    ('timestamp', '<i8'),   # mikrodetik sejak epoch (UTC)  
+    ('price', '<i8'),       # harga dalam sen  
+    ('rating', '<i2')       # rating x 100  
+])  
+
+# Indeks per produk untuk satu segmen (satu kali append): record segmen  
+# diurutkan menurut produk lalu posisi, sehingga pencarian cukup searchsorted  
+INDEX_DTYPE = np.dtype([  
+    ('product', '<u4'),  
+    ('position', '<u4')  
+])  
+
+# Batas jumlah segmen sebelum indeks digabung menjadi satu, agar biaya  
+# pencarian tidak terus bertambah seiring jumlah run  
+MAX_SEGMENTS = 32  
+
+# Harga penanda (tombstone) untuk run di mana produk tidak lagi muncul  
+TOMBSTONE_PRICE = -1  
+TOMBSTONE_VALUE = [TOMBSTONE_PRICE, -1]  
+
+TimeLike = Union[str, pd.Timestamp, None]  
+
+
+def _to_micros(value: TimeLike) -> Optional[int]:  
+    if value is None:  
+        return None  
+    
+    # Timestamp tanpa zona waktu adalah waktu lokal host, sama seperti skema PostgreSQL  
+    ts = to_utc_timestamp(value)  
+    return int(ts.value // 1000)  
+
+
+def _segment_index(records: np.ndarray, offset: int) -> np.ndarray:  
+    order = np.argsort(records['product'], kind='stable')  
+    index = np.empty(len(records), dtype=INDEX_DTYPE)  
+    index['product'] = records['product'][order]  
+    index['position'] = order + offset  
+    return index  
+
+
+class PriceHistoryStore:  
+    """  
+    Penyimpanan riwayat harga dan rating per produk yang hanya bisa ditambah.  
+    Record hanya ditulis ketika nilai produk berubah (run-length encoding),  
+    sehingga nilai yang tetap dari run ke run hampir tidak memakan tempat.  
+    Setiap append menjadi satu segmen dengan indeks per produk sendiri,  
+    jadi membuka store atau menambah data tidak mengurutkan ulang seluruh file.  
+    Setelah lebih dari MAX_SEGMENTS segmen, indeks digabung menjadi satu segmen.  
+    Produk yang hilang dari sebuah run dicatat sebagai record tombstone  
+    """  
+
+    def __init__(self, directory: Optional[str] = None):  
+        if directory is None:  
+            directory = os.path.join(os.getcwd(), 'price_history')  
+        
+        self.directory = os.path.abspath(directory)  
+        self.data_path = os.path.join(self.directory, 'observations.bin')  
+        self.index_path = os.path.join(self.directory, 'index.bin')  
+        self.meta_path = os.path.join(self.directory, 'products.json')  
+        os.makedirs(self.directory, exist_ok=True)  
+        
+        self.titles: List[str] = []  
+        self.product_ids: Dict[str, int] = {}  
+        self.last_seen: Dict[str, int] = {}  
+        self.latest: List[Optional[List[int]]] = []  
+        self.segments: List[int] = []  
+        self.max_timestamp: Optional[int] = None  
+        self._time_sorted = True  
+        self._load_meta()  
+        self._refresh()  
+
+    def _load_meta(self) -> None:  
+        if not os.path.exists(self.meta_path):  
+            return  
+        
+        with open(self.meta_path, 'r') as f:  
+            meta = json.load(f)  
+        
+        self.titles = meta.get('titles', [])  
+        self.product_ids = {title: pid for pid, title in enumerate(self.titles)}  
+        self.index_path = os.path.join(self.directory, meta.get('index_file', 'index.bin'))  
+        self.last_seen = meta.get('last_seen', {})  
+        
+        if 'segments' in meta:  
+            self.latest = meta.get('latest', [])  
+            self.segments = meta['segments']  
+            self.max_timestamp = meta.get('max_timestamp')  
+            self._time_sorted = meta.get('time_sorted', True)  
+        else:  
+            self._migrate()  
+
+    def _migrate(self) -> None:  
+        # Store lama tanpa indeks: seluruh record dijadikan satu segmen, sekali saja  
+        size = os.path.getsize(self.data_path) if os.path.exists(self.data_path) else 0  
+        count = size // RECORD_DTYPE.itemsize  
+        records = np.empty(0, dtype=RECORD_DTYPE)  
+        if count:  
+            records = np.fromfile(self.data_path, dtype=RECORD_DTYPE, count=count)  
+        
+        self.latest = [None] * len(self.titles)  
+        for record in records:  
+            self.latest[int(record['product'])] = [int(record['price']), int(record['rating'])]  
+        
+        with open(self.index_path, 'wb') as f:  
+            f.write(_segment_index(records, 0).tobytes())  
+        
+        self.segments = [count] if count else []  
+        self.max_timestamp = int(records['timestamp'].max()) if count else None  
+        self._time_sorted = bool(np.all(np.diff(records['timestamp']) >= 0))  
+        self._save_meta()  
+
+    def _save_meta(self) -> None:  
+        tmp_path = f"{self.meta_path}.tmp"  
+        with open(tmp_path, 'w') as f:  
+            json.dump({  
+                'titles': self.titles,  
+                'last_seen': self.last_seen,  
+                'latest': self.latest,  
+                'segments': self.segments,  
+                'index_file': os.path.basename(self.index_path),  
+                'max_timestamp': self.max_timestamp,  
+                'time_sorted': self._time_sorted  
+            }, f)  
+        os.replace(tmp_path, self.meta_path)  
+
+    @property  
+    def _committed(self) -> int:  
+        # Hanya record yang tercatat di metadata yang dianggap ada; sisa tulisan  
+        # dari proses yang terhenti di tengah jalan diabaikan lalu ditimpa  
+        return self.segments[-1] if self.segments else 0  
+
+    def _refresh(self) -> None:  
+        # Buka ulang memory map setelah file bertambah, tanpa mengurutkan apa pun  
+        count = self._committed  
+        
+        if count == 0:  
+            self.records = np.empty(0, dtype=RECORD_DTYPE)  
+            self.index = np.empty(0, dtype=INDEX_DTYPE)  
+        else:  
+            self.records = np.memmap(self.data_path, dtype=RECORD_DTYPE, mode='r', shape=(count,))  
+            self.index = np.memmap(self.index_path, dtype=INDEX_DTYPE, mode='r', shape=(count,))  
+
+    @staticmethod  
+    def _append_file(path: str, data: np.ndarray, committed: int) -> None:  
+        with open(path, 'ab') as f:  
+            f.truncate(committed * data.dtype.itemsize)  
+            f.write(data.tobytes())  
+
+    def append(self, df: pd.DataFrame) -> int:  
+        try:  
+            if df is None or df.empty:  
+                logger.warning("DataFrame kosong atau None")  
+                return 0  
+            
+            data = df[['Title', 'Price', 'Rating', 'Timestamp']].dropna()  
+            data = data.drop_duplicates(subset=['Title'], keep='first')  
+            
+            timestamps = to_utc(data['Timestamp'])  
+            micros = (timestamps.astype('int64') // 1000).to_numpy()  
+            prices = np.round(data['Price'].to_numpy(dtype=np.float64) * 100).astype(np.int64)  
+            ratings = np.round(data['Rating'].to_numpy(dtype=np.float64) * 100).astype(np.int16)  
+            
+            changes = []  
+            seen = set()  
+            
+            for title, ts, price, rating in zip(data['Title'], micros, prices, ratings):  
+                pid = self.product_ids.get(title)  
+                if pid is None:  
+                    pid = len(self.titles)  
+                    self.titles.append(title)  
+                    self.product_ids[title] = pid  
+                    self.latest.append(None)  
+                
+                self.last_seen[str(pid)] = int(ts)  
+                seen.add(pid)  
+                
+                # Lewati nilai yang sama dengan titik perubahan terakhir; setelah  
+                # tombstone, nilai lama pun menjadi titik perubahan baru  
+                value = [int(price), int(rating)]  
+                if self.latest[pid] == value:  
+                    continue  
+                self.latest[pid] = value  
+                changes.append((pid, ts, price, rating))  
+            
+            # Produk yang masih aktif tetapi tidak ada di batch dianggap tidak  
+            # dijual lagi sejak run ini; ketiadaannya ditulis ke store sebagai tombstone  
+            tombstones = []  
+            if len(micros):  
+                run_start = int(micros.min())  
+                for pid, value in enumerate(self.latest):  
+                    if pid in seen or value is None or value == TOMBSTONE_VALUE:  
+                        continue  
+                    self.latest[pid] = list(TOMBSTONE_VALUE)  
+                    tombstones.append((pid, run_start, *TOMBSTONE_VALUE))  
+            
+            if changes or tombstones:  
+                committed = self._committed  
+                records = np.array(tombstones + changes, dtype=RECORD_DTYPE)  
+                
+                # Record dan indeks ditulis lebih dulu; metadata menjadi titik commit  
+                self._append_file(self.data_path, records, committed)  
+                self._append_file(self.index_path, _segment_index(records, committed), committed)  
+                
+                # Urutan waktu global tetap terjaga selama setiap batch tidak mundur  
+                batch_times = records['timestamp']  
+                batch_sorted = bool(np.all(np.diff(batch_times) >= 0))  
+                batch_start, batch_end = int(batch_times.min()), int(batch_times.max())  
+                if self.max_timestamp is not None:  
+                    batch_sorted = batch_sorted and batch_start >= self.max_timestamp  
+                    batch_end = max(batch_end, self.max_timestamp)  
+                self._time_sorted = self._time_sorted and batch_sorted  
+                self.max_timestamp = batch_end  
+                self.segments.append(committed + len(records))  
+            
+            self._save_meta()  
+            if changes or tombstones:  
+                self._refresh()  
+            if len(self.segments) > MAX_SEGMENTS:  
+                self._compact()  
+            
+            logger.info(  
+                f"Riwayat harga: {len(changes)} perubahan dari {len(data)} observasi disimpan, "  
+                f"{len(tombstones)} produk tidak muncul lagi"  
+            )  
+            return len(changes)  
+        
+        except Exception as e:  
+            logger.error(f"Gagal menambahkan riwayat harga: {e}")  
+            return 0  
+
+    def _compact(self) -> None:  
+        # Gabungkan indeks semua segmen ke file baru; metadata yang menunjuk file  
+        # baru menjadi titik commit, jadi indeks lama tetap utuh jika proses terhenti  
+        count = self._committed  
+        records = np.fromfile(self.data_path, dtype=RECORD_DTYPE, count=count)  
+        old_path = self.index_path  
+        new_path = os.path.join(self.directory, f'index-{count}.bin')  
+        
+        with open(new_path, 'wb') as f:  
+            f.write(_segment_index(records, 0).tobytes())  
+        
+        self.index_path = new_path  
+        self.segments = [count]  
+        self._save_meta()  
+        self._refresh()  
+        
+        try:  
+            os.remove(old_path)  
+        except OSError as e:  
+            logger.warning(f"Gagal menghapus indeks lama {old_path}: {e}")  
+        
+        logger.info(f"Indeks riwayat harga digabung menjadi satu segmen ({count} record)")  
+
+    def _to_frame(self, records: np.ndarray) -> pd.DataFrame:  
+        # Tombstone hanya menandai ketiadaan produk, bukan harga  
+        records = records[records['price'] != TOMBSTONE_PRICE]  
+        return pd.DataFrame({  
+            'Title': [self.titles[pid] for pid in records['product']],  
+            'Timestamp': pd.to_datetime(records['timestamp'], unit='us', utc=True),  
+            'Price': records['price'] / 100.0,  
+            'Rating': records['rating'] / 100.0  
+        })  
+
+    def _time_mask(self, timestamps: np.ndarray, start: TimeLike, end: TimeLike) -> np.ndarray:  
+        mask = np.ones(len(timestamps), dtype=bool)  
+        if start is not None:  
+            mask &= timestamps >= _to_micros(start)  
+        if end is not None:  
+            mask &= timestamps <= _to_micros(end)  
+        return mask  
+
+    def _product_records(self, pid: Optional[int]) -> np.ndarray:  
+        if pid is None or len(self.records) == 0:  
+            return np.empty(0, dtype=RECORD_DTYPE)  
+        
+        # Cari produk di indeks setiap segmen; segmen sudah berurutan waktu  
+        positions = []  
+        start_offset = 0  
+        for end_offset in self.segments:  
+            products = self.index['product'][start_offset:end_offset]  
+            lower = start_offset + np.searchsorted(products, pid, side='left')  
+            upper = start_offset + np.searchsorted(products, pid, side='right')  
+            positions.append(self.index['position'][lower:upper])  
+            start_offset = end_offset  
+        
+        records = self.records[np.concatenate(positions).astype(np.intp)]  
+        return records[np.argsort(records['timestamp'], kind='stable')]  
+
+    def history(  
+        self,  
+        title: str,  
+        start: TimeLike = None,  
+        end: TimeLike = None,  
+        include_previous: bool = True  
+    ) -> pd.DataFrame:  
+        records = self._product_records(self.product_ids.get(title))  
+        
+        mask = self._time_mask(records['timestamp'], start, end)  
+        if include_previous and start is not None:  
+            # Sertakan nilai yang masih berlaku pada awal rentang  
+            before = np.flatnonzero(records['timestamp'] < _to_micros(start))  
+            if len(before):  
+                mask[before[-1]] = True  
+        
+        return self._to_frame(records[mask])  
+
+    def range(self, start: TimeLike = None, end: TimeLike = None) -> pd.DataFrame:  
+        timestamps = self.records['timestamp']  
+        
+        if self._time_sorted:  
+            lower = 0 if start is None else np.searchsorted(timestamps, _to_micros(start), side='left')  
+            upper = len(timestamps) if end is None else np.searchsorted(timestamps, _to_micros(end), side='right')  
+            return self._to_frame(np.asarray(self.records[lower:upper]))  
+        
+        return self._to_frame(np.asarray(self.records[self._time_mask(timestamps, start, end)]))  
+
+    def price_at(self, title: str, when: TimeLike) -> Optional[Dict]:  
+        records = self._product_records(self.product_ids.get(title))  
+        records = records[records['timestamp'] <= _to_micros(when)]  
+        
+        # Jika record terakhir adalah tombstone, produk sedang tidak dijual  
+        if len(records) == 0 or records['price'][-1] == TOMBSTONE_PRICE:  
+            return None  
+        return self._to_frame(records[-1:]).iloc[0].to_dict()  
+
+    def stats(self) -> Dict:  
+        return {  
+            'products': len(self.titles),  
+            'records': int(len(self.records)),  
+            'bytes': int(len(self.records) * RECORD_DTYPE.itemsize),  
+            'segments': len(self.segments)  
+        }  
@@ -1,10 +1,11 @@
 import logging  
 import os  
 import pandas as pd 
-from typing import Optional, Dict, Union  
-from sqlalchemy import create_engine  
-from google.oauth2 import service_account  
-from googleapiclient.discovery import build  
+from datetime import date  
+from typing import Optional, Dict, List  
+
+from utils.schema import PRODUCT_COLUMNS, PostgresSchemaManager, _validate_identifier  
+from utils.verify import DIGEST_COLUMNS, BatchDigest, ConsistencyVerifier, verify_load  
 
 # Konfigurasi Logging  
 logging.basicConfig(  
@@ -13,6 +14,47 @@ logging.basicConfig(
 )  
 logger = logging.getLogger(__name__)  
 
+# Modul berat (sqlalchemy, Google API, pyarrow) diimpor secara lokal di dalam  
+# method sink saat benar-benar dipakai, bukan saat modul ini diimpor  
+
+# Kunci produk untuk upsert SQLite: satu baris per produk, nilai terbaru menang  
+SQLITE_KEY_COLUMNS = ['Title', 'Size', 'Gender', 'Colors']  
+
+
+def sqlite_statements(table_name: str) -> Dict[str, object]:  
+    table = _validate_identifier(table_name)  
+    columns = ', '.join(f'"{col}"' for col in PRODUCT_COLUMNS)  
+    key = ', '.join(f'"{col}"' for col in SQLITE_KEY_COLUMNS)  
+    updates = ', '.join(  
+        f'"{col}" = excluded."{col}"' for col in PRODUCT_COLUMNS if col not in SQLITE_KEY_COLUMNS  
+    )  
+    
+    return {  
+        'create_table': f'''  
+            CREATE TABLE IF NOT EXISTS {table} (  
+                "Title" TEXT NOT NULL,  
+                "Price" REAL NOT NULL,  
+                "Rating" REAL NOT NULL,  
+                "Colors" INTEGER NOT NULL,  
+                "Size" TEXT NOT NULL,  
+                "Gender" TEXT NOT NULL,  
+                "Timestamp" TEXT NOT NULL,  
+                PRIMARY KEY ({key})  
+            )  
+        ''',  
+        # Indeks covering: filter Gender/Size + rentang harga dijawab dari indeks saja  
+        'create_indexes': [  
+            f'CREATE INDEX IF NOT EXISTS {table}_gender_size_price '  
+            f'ON {table} ("Gender", "Size", "Price", "Rating", "Title")',  
+            f'CREATE INDEX IF NOT EXISTS {table}_price '  
+            f'ON {table} ("Price", "Rating", "Title")'  
+        ],  
+        'upsert': (  
+            f'INSERT INTO {table} ({columns}) VALUES ({", ".join("?" for _ in PRODUCT_COLUMNS)}) '  
+            f'ON CONFLICT ({key}) DO UPDATE SET {updates}'  
+        )  
+    }  
+
 class DataLoader:  
     def __init__(  
         self,  
@@ -34,16 +76,64 @@ class DataLoader:
             self.csv_path = os.path.abspath(csv_path)  
             self.google_credentials = os.path.abspath(google_credentials)  
             
+            # Engine database dan client Google Sheets dipakai ulang antar run  
+            self._engines: Dict[str, object] = {}  
+            self._sheets_service = None  
+            self._sqlite_connections: Dict[str, object] = {}  
+            
+            # Manifest digest per sink untuk verifikasi tanpa membaca ulang data  
+            self.verifier = ConsistencyVerifier(os.path.join(os.path.dirname(self.csv_path), 'manifests'))  
+            self.last_verification: Dict[str, Dict] = {}  
+            
             logger.info(f"Inisialisasi DataLoader dengan path: {self.csv_path}")  
         
         except Exception as e:  
             logger.error(f"Gagal menginisialisasi DataLoader: {e}")  
             raise  
 
+    def _get_engine(self, connection_string: str):  
+        # sqlalchemy diimpor saat dibutuhkan agar impor modul ini tetap ringan  
+        from sqlalchemy import create_engine  
+        
+        engine = self._engines.get(connection_string)  
+        if engine is None:  
+            engine = create_engine(connection_string)  
+            self._engines[connection_string] = engine  
+        return engine  
+
+    def _get_sqlite(self, db_path: str):  
+        import sqlite3  
+        
+        conn = self._sqlite_connections.get(db_path)  
+        if conn is None:  
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)  
+            
+            # Run daemon berjalan di thread berbeda, tetapi tidak pernah bersamaan (RunLock)  
+            conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)  
+            conn.execute('PRAGMA journal_mode=WAL')  
+            conn.execute('PRAGMA synchronous=NORMAL')  
+            conn.execute('PRAGMA temp_store=MEMORY')  
+            self._sqlite_connections[db_path] = conn  
+        return conn  
+
+    def _get_sheets_service(self):  
+        if self._sheets_service is None:  
+            from google.oauth2 import service_account  
+            from googleapiclient.discovery import build  
+            
+            credentials = service_account.Credentials.from_service_account_file(  
+                self.google_credentials,  
+                scopes=['https://www.googleapis.com/auth/spreadsheets']  
+            )  
+            self._sheets_service = build('sheets', 'v4', credentials=credentials)  
+        return self._sheets_service  
+
     def save_to_csv(  
         self,  
         df: pd.DataFrame,  
-        filename: Optional[str] = None  
+        filename: Optional[str] = None,  
+        required_columns: Optional[List[str]] = None,  
+        digest: Optional[BatchDigest] = None  
     ) -> bool:  
         try:  
             # Validasi input  
@@ -56,7 +146,8 @@ class DataLoader:
                 raise TypeError("Input harus DataFrame pandas")  
             
             # Validasi kolom wajib  
-            required_columns = ['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender']  
+            if required_columns is None:  
+                required_columns = ['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender']  
             missing_columns = [col for col in required_columns if col not in df.columns]  
             
             if missing_columns:  
@@ -72,6 +163,57 @@ class DataLoader:
             # Simpan ke CSV  
             df.to_csv(save_path, index=False)  
             
+            self._write_csv_manifest(save_path, digest)  
+            
+            logger.info(f"Data berhasil disimpan ke {save_path}")  
+            return True  
+        
+        except Exception as e:  
+            logger.error(f"Gagal menyimpan ke CSV: {e}")  
+            return False  
+
+    def _write_csv_manifest(self, save_path: str, digest: Optional[BatchDigest]) -> None:  
+        # Digest dihitung dari file yang baru ditulis (dibaca ulang sekali), lalu  
+        # dicatat beserta ukuran dan mtime-nya; digest batch dibandingkan saat verifikasi  
+        if digest is None:  
+            return  
+        
+        written = BatchDigest.from_csv(save_path)  
+        stat = os.stat(save_path)  
+        self.verifier.write_manifest(  
+            'csv',  
+            os.path.abspath(save_path),  
+            written,  
+            size=stat.st_size,  
+            mtime_ns=stat.st_mtime_ns  
+        )  
+
+    def save_arrow_to_csv(  
+        self,  
+        table,  
+        filename: Optional[str] = None,  
+        digest: Optional[BatchDigest] = None  
+    ) -> bool:  
+        try:  
+            # Validasi input  
+            if table is None or table.num_rows == 0:  
+                logger.warning("Tabel Arrow kosong atau None")  
+                return False  
+            
+            missing_columns = [col for col in PRODUCT_COLUMNS[:-1] if col not in table.column_names]  
+            if missing_columns:  
+                logger.warning(f"Kolom hilang: {missing_columns}")  
+                return False  
+            
+            import pyarrow.csv as pa_csv  
+            
+            save_path = filename or self.csv_path  
+            os.makedirs(os.path.dirname(save_path), exist_ok=True)  
+            
+            # Ditulis langsung dari buffer kolom Arrow  
+            pa_csv.write_csv(table, save_path)  
+            self._write_csv_manifest(save_path, digest)  
+            
             logger.info(f"Data berhasil disimpan ke {save_path}")  
             return True  
         
@@ -79,9 +221,30 @@ class DataLoader:
             logger.error(f"Gagal menyimpan ke CSV: {e}")  
             return False  
 
+    def save_to_parquet(self, table, filename: Optional[str] = None) -> bool:  
+        try:  
+            # Validasi input  
+            if table is None or table.num_rows == 0:  
+                logger.warning("Tabel Arrow kosong atau None")  
+                return False  
+            
+            import pyarrow.parquet as pq  
+            
+            save_path = filename or os.path.splitext(self.csv_path)[0] + '.parquet'  
+            os.makedirs(os.path.dirname(save_path), exist_ok=True)  
+            
+            pq.write_table(table, save_path)  
+            
+            logger.info(f"Data berhasil disimpan ke {save_path}")  
+            return True  
+        
+        except Exception as e:  
+            logger.error(f"Gagal menyimpan ke Parquet: {e}")  
+            return False  
+
     def save_to_postgresql(  
-        self,   
-        df: pd.DataFrame,   
+        self,  
+        df: pd.DataFrame,  
         connection_string: str,  
         table_name: str = 'fashion_products'  
     ) -> bool:  
@@ -95,29 +258,213 @@ class DataLoader:
             if isinstance(connection_string, tuple):  
                 connection_string = connection_string[0]
 
-            # Buat koneksi engine  
-            engine = create_engine(connection_string)  
+            # Buat koneksi engine (dipakai ulang jika sudah ada)  
+            engine = self._get_engine(connection_string)  
+            schema = PostgresSchemaManager(table_name)  
+            
+            with engine.begin() as conn:  
+                # Buat atau migrasikan skema, lalu siapkan partisi tanggal scraping  
+                schema.migrate(conn)  
+                prepared_df = schema.prepare_frame(df)  
+                schema.ensure_partitions(conn, prepared_df['Timestamp'])  
+                
+                # Simpan ke database  
+                prepared_df.to_sql(  
+                    name=table_name,  
+                    con=conn,  
+                    if_exists='append',  
+                    index=False,  
+                    method='multi',  
+                    chunksize=1000  
+                )  
+            
+            logger.info(f"Data berhasil disimpan ke tabel {table_name}")  
+            return True  
+        
+        except Exception as e:  
+            logger.error(f"Gagal menyimpan ke PostgreSQL: {e}")  
+            return False  
+
+    def save_arrow_to_postgresql(  
+        self,  
+        table,  
+        connection_string: str,  
+        table_name: str = 'fashion_products'  
+    ) -> bool:  
+        try:  
+            # Validasi input  
+            if table is None or table.num_rows == 0:  
+                logger.warning("Tabel Arrow kosong atau None")  
+                return False  
+            
+            import pyarrow as pa  
+            import pyarrow.csv as pa_csv  
+            from utils.columnar import prepare_table  
+            
+            engine = self._get_engine(connection_string)  
+            schema = PostgresSchemaManager(table_name)  
+            prepared = prepare_table(table, PRODUCT_COLUMNS)  
+            
+            # Buffer CSV ditulis langsung dari kolom Arrow lalu dialirkan lewat COPY  
+            buffer = pa.BufferOutputStream()  
+            pa_csv.write_csv(prepared, buffer, write_options=pa_csv.WriteOptions(include_header=False))  
+            columns = ', '.join(f'"{name}"' for name in prepared.column_names)  
+            
+            with engine.begin() as conn:  
+                schema.migrate(conn)  
+                schema.ensure_partitions(conn, prepared.column('Timestamp').unique().to_pandas())  
+                
+                cursor = conn.connection.cursor()  
+                try:  
+                    cursor.copy_expert(  
+                        f"COPY {table_name} ({columns}) FROM STDIN WITH (FORMAT csv)",  
+                        pa.BufferReader(buffer.getvalue())  
+                    )  
+                finally:  
+                    cursor.close()  
+            
+            logger.info(f"Data berhasil disalin (COPY) ke tabel {table_name}")  
+            return True  
+        
+        except Exception as e:  
+            logger.error(f"Gagal menyalin ke PostgreSQL: {e}")  
+            return False  
+
+    def save_to_sqlite(  
+        self,  
+        df: pd.DataFrame,  
+        db_path: Optional[str] = None,  
+        table_name: str = 'fashion_products'  
+    ) -> bool:  
+        try:  
+            # Validasi input  
+            if df is None or df.empty:  
+                logger.warning("DataFrame kosong atau None")  
+                return False  
+            
+            missing_columns = [col for col in PRODUCT_COLUMNS if col not in df.columns]  
+            if missing_columns:  
+                logger.warning(f"Kolom hilang: {missing_columns}")  
+                return False  
+            
+            prepared = PostgresSchemaManager.prepare_frame(df).dropna()  
+            prepared['Timestamp'] = prepared['Timestamp'].map(lambda ts: ts.isoformat())  
+            
+            # tolist() menghasilkan tipe Python yang bisa langsung di-bind sqlite3  
+            rows = list(zip(*(prepared[col].tolist() for col in PRODUCT_COLUMNS)))  
+            
+            self._write_sqlite(rows, db_path, table_name)  
+            return True  
+        
+        except Exception as e:  
+            logger.error(f"Gagal menyimpan ke SQLite: {e}")  
+            return False  
+
+    def save_arrow_to_sqlite(  
+        self,  
+        table,  
+        db_path: Optional[str] = None,  
+        table_name: str = 'fashion_products'  
+    ) -> bool:  
+        try:  
+            # Validasi input  
+            if table is None or table.num_rows == 0:  
+                logger.warning("Tabel Arrow kosong atau None")  
+                return False  
+            
+            missing_columns = [col for col in PRODUCT_COLUMNS if col not in table.column_names]  
+            if missing_columns:  
+                logger.warning(f"Kolom hilang: {missing_columns}")  
+                return False  
+            
+            from utils.columnar import prepare_table  
+            
+            # Tipe dan timestamp UTC sama dengan jalur pandas (prepare_frame)  
+            prepared = prepare_table(table, PRODUCT_COLUMNS).drop_null()  
+            columns = [prepared.column(col).to_pylist() for col in PRODUCT_COLUMNS]  
+            columns[-1] = [ts.isoformat() for ts in columns[-1]]  
+            
+            self._write_sqlite(list(zip(*columns)), db_path, table_name)  
+            return True  
+        
+        except Exception as e:  
+            logger.error(f"Gagal menyimpan ke SQLite: {e}")  
+            return False  
+
+    def _write_sqlite(self, rows: List[tuple], db_path: Optional[str], table_name: str) -> None:  
+        # Default database di samping file CSV  
+        if db_path is None:  
+            db_path = os.path.splitext(self.csv_path)[0] + '.db'  
+        db_path = os.path.abspath(db_path)  
+        
+        statements = sqlite_statements(table_name)  
+        conn = self._get_sqlite(db_path)  
+        
+        # Satu transaksi untuk DDL dan seluruh batch; rollback otomatis jika gagal  
+        with conn:  
+            conn.execute('BEGIN IMMEDIATE')  
+            conn.execute(statements['create_table'])  
+            for statement in statements['create_indexes']:  
+                conn.execute(statement)  
+            conn.executemany(statements['upsert'], rows)  
+        
+        logger.info(f"{len(rows)} baris berhasil disimpan ke SQLite {db_path} ({table_name})")  
+
+    def save_rollups_to_postgresql(  
+        self,  
+        df: pd.DataFrame,  
+        connection_string: str,  
+        table_name: str = 'fashion_rollups'  
+    ) -> bool:  
+        try:  
+            # Validasi input  
+            if df is None or df.empty:  
+                logger.warning("DataFrame kosong atau None")  
+                return False  
             
-            # Simpan ke database  
+            # Tabel rollup kecil sehingga cukup diganti seluruhnya  
+            engine = self._get_engine(connection_string)  
             df.to_sql(  
-                name=table_name,   
-                con=engine,   
-                if_exists='replace',   
+                name=table_name,  
+                con=engine,  
+                if_exists='replace',  
                 index=False  
             )  
-        
-            logger.info(f"Data berhasil disimpan ke tabel {table_name}")  
+            
+            logger.info(f"Rollup berhasil disimpan ke tabel {table_name}")  
             return True  
         
         except Exception as e:  
-            logger.error(f"Gagal menyimpan ke PostgreSQL: {e}")  
+            logger.error(f"Gagal menyimpan rollup ke PostgreSQL: {e}")  
             return False  
 
+    def drop_postgresql_partitions(  
+        self,  
+        connection_string: str,  
+        before: date,  
+        table_name: str = 'fashion_products'  
+    ) -> List[str]:  
+        try:  
+            engine = self._get_engine(connection_string)  
+            schema = PostgresSchemaManager(table_name)  
+            
+            # Partisi yang seluruh isinya lebih lama dari tanggal `before` dihapus  
+            with engine.begin() as conn:  
+                dropped = schema.drop_partitions_before(conn, before)  
+            
+            logger.info(f"Partisi dihapus dari {table_name}: {dropped}")  
+            return dropped  
+        
+        except Exception as e:  
+            logger.error(f"Gagal menghapus partisi PostgreSQL: {e}")  
+            return []  
+
     def save_to_google_sheets(  
         self,   
         df: pd.DataFrame,   
         spreadsheet_id: str,  
-        range_name: str = 'Sheet1!A1'  
+        range_name: str = 'Sheet1!A1',  
+        digest: Optional[BatchDigest] = None  
     ) -> bool:  
         try:  
             # Validasi input  
@@ -130,27 +477,32 @@ class DataLoader:
                 logger.error("Kredensial Google Sheets tidak ditemukan")  
                 return False  
             
-            # Autentikasi  
-            credentials = service_account.Credentials.from_service_account_file(  
-                self.google_credentials,  
-                scopes=['https://www.googleapis.com/auth/spreadsheets']  
-            )  
-            
-            # Bangun layanan Google Sheets  
-            service = build('sheets', 'v4', credentials=credentials)  
+            # Autentikasi dan bangun layanan Google Sheets (di-cache per DataLoader)  
+            service = self._get_sheets_service()  
             
             # Konversi DataFrame ke format yang dapat ditulis  
             values = [df.columns.tolist()] + df.values.tolist()  
             
             # Perbarui spreadsheet  
             request_body = {'values': values}  
-            service.spreadsheets().values().update(  
+            response = service.spreadsheets().values().update(  
                 spreadsheetId=spreadsheet_id,  
                 range=range_name,  
                 valueInputOption='RAW',  
                 body=request_body  
             ).execute()  
             
+            # Digest nilai yang benar-benar dikirim disimpan bersama jumlah baris  
+            # yang dilaporkan API  
+            if digest is not None:  
+                updated_rows = response.get('updatedRows') if isinstance(response, dict) else None  
+                self.verifier.write_manifest(  
+                    'google_sheets',  
+                    f"{spreadsheet_id}_{range_name}",  
+                    BatchDigest.from_values(values),  
+                    updated_rows=updated_rows  
+                )  
+            
             logger.info(f"Data berhasil disimpan ke Google Sheets: {spreadsheet_id}")  
             return True  
         
@@ -162,21 +514,33 @@ def load_data(
     df: pd.DataFrame,  
     csv_path: Optional[str] = None,  
     postgresql_config: Optional[Dict[str, str]] = None,  
-    google_sheets_config: Optional[Dict[str, str]] = None  
+    google_sheets_config: Optional[Dict[str, str]] = None,  
+    loader: Optional[DataLoader] = None,  
+    verify: bool = False,  
+    sqlite_config: Optional[Dict[str, str]] = None  
 ) -> Dict[str, bool]:  
     # Default path jika tidak disediakan  
     if csv_path is None:  
         csv_path = os.path.join(os.getcwd(), 'products.csv')  
+    csv_path = os.path.abspath(csv_path)  
     
-    loader = DataLoader(csv_path)  
+    # Loader yang sudah ada membawa engine dan client yang masih hangat  
+    if loader is None:  
+        loader = DataLoader(csv_path)  
     
     result = {  
         'csv': False,  
         'postgresql': False,  
         'google_sheets': False  
     }  
+    
+    # Digest batch dihitung sekali dan dicatat oleh setiap sink saat menulis  
+    digest = None  
+    if verify and df is not None and not df.empty:  
+        digest = BatchDigest.from_frame(df)  
+    
     # Simpan ke CSV  
-    result['csv'] = loader.save_to_csv(df)  
+    result['csv'] = loader.save_to_csv(df, filename=csv_path, digest=digest)  
     
     # Simpan ke PostgreSQL jika konfigurasi tersedia  
     if postgresql_config:  
@@ -186,12 +550,157 @@ def load_data(
             postgresql_config.get('table_name', 'fashion_products')  
         )  
     
+    # Simpan ke SQLite lokal jika konfigurasi tersedia  
+    if sqlite_config:  
+        result['sqlite'] = loader.save_to_sqlite(  
+            df,  
+            sqlite_config.get('db_path'),  
+            sqlite_config.get('table_name', 'fashion_products')  
+        )  
+    
+    # Simpan ke Google Sheets jika konfigurasi tersedia  
+    if google_sheets_config:  
+        result['google_sheets'] = loader.save_to_google_sheets(  
+            df,  
+            google_sheets_config.get('spreadsheet_id', ''),  
+            google_sheets_config.get('range_name', 'Sheet1!A1'),  
+            digest=digest  
+        )  
+    
+    # Verifikasi hanya sink yang berhasil ditulis  
+    if digest is not None:  
+        loader.last_verification = verify_load(  
+            digest,  
+            loader,  
+            csv_path=csv_path if result['csv'] else None,  
+            postgresql_config=postgresql_config if result['postgresql'] else None,  
+            google_sheets_config=google_sheets_config if result['google_sheets'] else None  
+        )  
+        result.update({  
+            f"verify_{sink}": report['ok']  
+            for sink, report in loader.last_verification.items()  
+        })  
+    
+    return result  
+
+def load_rollups(  
+    df: pd.DataFrame,  
+    csv_path: Optional[str] = None,  
+    postgresql_config: Optional[Dict[str, str]] = None,  
+    google_sheets_config: Optional[Dict[str, str]] = None,  
+    loader: Optional[DataLoader] = None  
+) -> Dict[str, bool]:  
+    # Default path jika tidak disediakan  
+    if csv_path is None:  
+        csv_path = os.path.join(os.getcwd(), 'rollups.csv')  
+    csv_path = os.path.abspath(csv_path)  
+    
+    if loader is None:  
+        loader = DataLoader(csv_path)  
+    
+    result = {  
+        'csv': False,  
+        'postgresql': False,  
+        'google_sheets': False  
+    }  
+    # Simpan ke CSV  
+    result['csv'] = loader.save_to_csv(  
+        df,  
+        filename=csv_path,  
+        required_columns=['Gender', 'Size', 'Count']  
+    )  
+    
+    # Simpan ke PostgreSQL jika konfigurasi tersedia  
+    if postgresql_config:  
+        result['postgresql'] = loader.save_rollups_to_postgresql(  
+            df,  
+            postgresql_config.get('connection_string', ''),  
+            postgresql_config.get('table_name', 'fashion_rollups')  
+        )  
+    
     # Simpan ke Google Sheets jika konfigurasi tersedia  
     if google_sheets_config:  
         result['google_sheets'] = loader.save_to_google_sheets(  
             df,  
             google_sheets_config.get('spreadsheet_id', ''),  
-            google_sheets_config.get('range_name', 'Sheet1!A1')  
+            google_sheets_config.get('range_name', 'Rollups!A1')  
+        )  
+    
+    return result  
+
+def load_arrow(  
+    table,  
+    csv_path: Optional[str] = None,  
+    parquet_path: Optional[str] = None,  
+    postgresql_config: Optional[Dict[str, str]] = None,  
+    google_sheets_config: Optional[Dict[str, str]] = None,  
+    loader: Optional[DataLoader] = None,  
+    verify: bool = False,  
+    sqlite_config: Optional[Dict[str, str]] = None  
+) -> Dict[str, bool]:  
+    # Default path jika tidak disediakan  
+    if csv_path is None:  
+        csv_path = os.path.join(os.getcwd(), 'products.csv')  
+    csv_path = os.path.abspath(csv_path)  
+    if parquet_path is None:  
+        parquet_path = os.path.splitext(csv_path)[0] + '.parquet'  
+    
+    if loader is None:  
+        loader = DataLoader(csv_path)  
+    
+    result = {  
+        'csv': False,  
+        'parquet': False,  
+        'postgresql': False,  
+        'google_sheets': False  
+    }  
+    
+    # Digest dihitung dari kolom yang diverifikasi saja (satu konversi kecil ke pandas)  
+    digest = None  
+    if verify and table is not None and table.num_rows > 0:  
+        digest = BatchDigest.from_frame(table.select(DIGEST_COLUMNS).to_pandas())  
+    
+    # Simpan ke CSV dan Parquet langsung dari tabel Arrow  
+    result['csv'] = loader.save_arrow_to_csv(table, filename=csv_path, digest=digest)  
+    result['parquet'] = loader.save_to_parquet(table, filename=os.path.abspath(parquet_path))  
+    
+    # Simpan ke PostgreSQL dengan COPY jika konfigurasi tersedia  
+    if postgresql_config:  
+        result['postgresql'] = loader.save_arrow_to_postgresql(  
+            table,  
+            postgresql_config.get('connection_string', ''),  
+            postgresql_config.get('table_name', 'fashion_products')  
+        )  
+    
+    # Simpan ke SQLite lokal jika konfigurasi tersedia  
+    if sqlite_config:  
+        result['sqlite'] = loader.save_arrow_to_sqlite(  
+            table,  
+            sqlite_config.get('db_path'),  
+            sqlite_config.get('table_name', 'fashion_products')  
+        )  
+    
+    # API Google Sheets menerima nilai JSON, jadi di sini tabel tetap dikonversi  
+    if google_sheets_config:  
+        result['google_sheets'] = loader.save_to_google_sheets(  
+            table.to_pandas(),  
+            google_sheets_config.get('spreadsheet_id', ''),  
+            google_sheets_config.get('range_name', 'Sheet1!A1'),  
+            digest=digest  
+        )  
+    
+    # Verifikasi sama seperti load_data; Parquet tidak diverifikasi  
+    if digest is not None:  
+        loader.last_verification = verify_load(  
+            digest,  
+            loader,  
+            csv_path=csv_path if result['csv'] else None,  
+            postgresql_config=postgresql_config if result['postgresql'] else None,  
+            google_sheets_config=google_sheets_config if result['google_sheets'] else None  
         )  
+        result.update({  
+            f"verify_{sink}": report['ok']  
+            for sink, report in loader.last_verification.items()  
+        })  
     
-    return result
\ No newline at end of file
+    return result  
\ No newline at end of file
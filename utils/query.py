@@ -0,0 +1,216 @@
+import logging  
+import os  
+import threading  
+from typing import Dict, List, Optional, Tuple  
+
+import numpy as np  
+import pandas as pd  
+
+# Konfigurasi Logging  
+logging.basicConfig(  
+    level=logging.INFO,  
+    format='%(asctime)s - %(levelname)s: %(message)s'  
+)  
+logger = logging.getLogger(__name__)  
+
+INDEX_COLUMNS = ['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender']  
+SORT_COLUMNS = ('Price', 'Rating')  
+
+
+class ProductIndex:  
+    """  
+    Snapshot produk bersifat read-only dalam bentuk kolom numpy dengan  
+    posting list per Gender, Size dan kombinasi keduanya yang terurut menurut harga  
+    """  
+
+    def __init__(self, df: pd.DataFrame, version: int = 0):  
+        missing_columns = [col for col in INDEX_COLUMNS if col not in df.columns]  
+        if missing_columns:  
+            raise ValueError(f"Kolom hilang: {missing_columns}")  
+        
+        data = df[INDEX_COLUMNS].dropna()  
+        
+        self.version = version  
+        self.size = len(data)  
+        
+        # Kolom disimpan terpisah dengan tipe sekecil mungkin; harga dan rating  
+        # tetap float64 agar batas inklusif (misalnya 4.1) dibandingkan apa adanya  
+        self.titles = data['Title'].astype(str).to_numpy(dtype=object)  
+        self.price = data['Price'].to_numpy(dtype=np.float64)  
+        self.rating = data['Rating'].to_numpy(dtype=np.float64)  
+        self.colors = data['Colors'].to_numpy(dtype=np.int16)  
+        
+        gender = pd.Categorical(data['Gender'].astype(str))  
+        size = pd.Categorical(data['Size'].astype(str))  
+        self.gender_codes = gender.codes.astype(np.int16)  
+        self.size_codes = size.codes.astype(np.int16)  
+        self.genders = {value: code for code, value in enumerate(gender.categories)}  
+        self.sizes = {value: code for code, value in enumerate(size.categories)}  
+        self._gender_values = np.asarray(gender.categories, dtype=object)  
+        self._size_values = np.asarray(size.categories, dtype=object)  
+        
+        self._postings = self._build_postings()  
+
+    def _build_postings(self) -> Dict[Tuple[Optional[int], Optional[int]], Tuple[np.ndarray, np.ndarray]]:  
+        # Urutan global berdasarkan harga; setiap posting list mewarisi urutan ini  
+        order = np.argsort(self.price, kind='stable')  
+        gender_sorted = self.gender_codes[order]  
+        size_sorted = self.size_codes[order]  
+        
+        postings = {(None, None): order}  
+        for code in self.genders.values():  
+            postings[(code, None)] = order[gender_sorted == code]  
+        for code in self.sizes.values():  
+            postings[(None, code)] = order[size_sorted == code]  
+        
+        pairs = np.unique(np.stack([gender_sorted, size_sorted], axis=1), axis=0)  
+        for gender_code, size_code in pairs:  
+            mask = (gender_sorted == gender_code) & (size_sorted == size_code)  
+            postings[(int(gender_code), int(size_code))] = order[mask]  
+        
+        # Simpan harga terurut per posting list untuk pencarian biner  
+        return {key: (ids, self.price[ids]) for key, ids in postings.items()}  
+
+    def __len__(self) -> int:  
+        return self.size  
+
+    def query_ids(  
+        self,  
+        gender: Optional[str] = None,  
+        size: Optional[str] = None,  
+        min_price: Optional[float] = None,  
+        max_price: Optional[float] = None,  
+        min_rating: Optional[float] = None,  
+        max_rating: Optional[float] = None,  
+        sort_by: str = 'Price',  
+        ascending: bool = True,  
+        limit: Optional[int] = None  
+    ) -> np.ndarray:  
+        if sort_by not in SORT_COLUMNS:  
+            raise ValueError(f"sort_by harus salah satu dari {SORT_COLUMNS}")  
+        if limit is not None and limit < 0:  
+            raise ValueError("limit tidak boleh negatif")  
+        
+        gender_code = None  
+        if gender is not None:  
+            gender_code = self.genders.get(gender)  
+            if gender_code is None:  
+                return np.empty(0, dtype=np.intp)  
+        
+        size_code = None  
+        if size is not None:  
+            size_code = self.sizes.get(size)  
+            if size_code is None:  
+                return np.empty(0, dtype=np.intp)  
+        
+        ids, prices = self._postings.get((gender_code, size_code), (np.empty(0, dtype=np.intp), None))  
+        if len(ids) == 0:  
+            return ids  
+        
+        # Rentang harga cukup dicari dengan searchsorted karena posting list terurut  
+        lower = 0 if min_price is None else np.searchsorted(prices, min_price, side='left')  
+        upper = len(ids) if max_price is None else np.searchsorted(prices, max_price, side='right')  
+        ids = ids[lower:upper]  
+        
+        if min_rating is not None or max_rating is not None:  
+            ratings = self.rating[ids]  
+            mask = np.ones(len(ids), dtype=bool)  
+            if min_rating is not None:  
+                mask &= ratings >= min_rating  
+            if max_rating is not None:  
+                mask &= ratings <= max_rating  
+            ids = ids[mask]  
+        
+        if sort_by == 'Price':  
+            if not ascending:  
+                ids = ids[::-1]  
+            return ids if limit is None else ids[:limit]  
+        
+        # Urutan rating: top-k memakai argpartition sebelum mengurutkan sisa kandidat  
+        keys = self.rating[ids] if ascending else -self.rating[ids]  
+        if limit is not None and limit < len(ids):  
+            if limit == 0:  
+                return ids[:0]  
+            candidates = np.sort(np.argpartition(keys, limit - 1)[:limit])  
+            ids, keys = ids[candidates], keys[candidates]  
+        
+        return ids[np.argsort(keys, kind='stable')]  
+
+    def records(self, ids: np.ndarray) -> List[Dict]:  
+        return [  
+            {  
+                'Title': self.titles[i],  
+                'Price': float(self.price[i]),  
+                'Rating': round(float(self.rating[i]), 2),  
+                'Colors': int(self.colors[i]),  
+                'Size': self._size_values[self.size_codes[i]],  
+                'Gender': self._gender_values[self.gender_codes[i]]  
+            }  
+            for i in ids  
+        ]  
+
+    def query(self, **filters) -> List[Dict]:  
+        return self.records(self.query_ids(**filters))  
+
+
+class ProductSnapshotStore:  
+    """  
+    Menyimpan ProductIndex terbaru dan menggantinya secara atomik ketika  
+    pipeline selesai menghasilkan data bersih yang baru  
+    """  
+
+    def __init__(self, csv_path: Optional[str] = None):  
+        if csv_path is None:  
+            csv_path = os.path.join(os.getcwd(), 'products.csv')  
+        
+        self.csv_path = os.path.abspath(csv_path)  
+        self._index: Optional[ProductIndex] = None  
+        self._lock = threading.Lock()  
+        self._version = 0  
+
+    @property  
+    def current(self) -> Optional[ProductIndex]:  
+        return self._index  
+
+    def publish(self, df: pd.DataFrame) -> Optional[ProductIndex]:  
+        try:  
+            if df is None or df.empty:  
+                logger.warning("DataFrame kosong atau None")  
+                return None  
+            
+            with self._lock:  
+                self._version += 1  
+                version = self._version  
+            
+            # Indeks dibangun di luar lock; pembaca tetap memakai snapshot lama  
+            index = ProductIndex(df, version=version)  
+            
+            with self._lock:  
+                if self._index is None or self._index.version < index.version:  
+                    self._index = index  
+            
+            logger.info(f"Snapshot produk versi {index.version} aktif dengan {len(index)} produk")  
+            return index  
+        
+        except Exception as e:  
+            logger.error(f"Gagal membangun snapshot produk: {e}")  
+            return None  
+
+    def load_latest(self) -> Optional[ProductIndex]:  
+        try:  
+            if not os.path.exists(self.csv_path):  
+                logger.warning(f"File snapshot tidak ditemukan: {self.csv_path}")  
+                return None  
+            
+            return self.publish(pd.read_csv(self.csv_path))  
+        
+        except Exception as e:  
+            logger.error(f"Gagal memuat snapshot dari CSV: {e}")  
+            return None  
+
+    def query(self, **filters) -> List[Dict]:  
+        # Ambil referensi sekali agar satu query selalu membaca satu snapshot  
+        index = self._index  
+        if index is None:  
+            return []  
+        return index.query(**filters)  
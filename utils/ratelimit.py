@@ -0,0 +1,245 @@
+import logging  
+import random  
+import threading  
+import time  
+from collections import deque  
+from contextlib import contextmanager  
+from datetime import datetime, timezone  
+from email.utils import parsedate_to_datetime  
+from typing import Callable, Deque, Dict, Optional  
+
+# Konfigurasi Logging  
+logging.basicConfig(  
+    level=logging.INFO,  
+    format='%(asctime)s - %(levelname)s: %(message)s'  
+)  
+logger = logging.getLogger(__name__)  
+
+# Status HTTP yang menandakan server meminta klien melambat  
+THROTTLE_STATUS_CODES = (429, 503)  
+
+
+def parse_retry_after(value: Optional[str], now: Optional[datetime] = None) -> Optional[float]:  
+    # Retry-After bisa berupa jumlah detik atau tanggal HTTP  
+    if not value:  
+        return None  
+    
+    value = str(value).strip()  
+    if value.isdigit():  
+        return float(value)  
+    
+    try:  
+        when = parsedate_to_datetime(value)  
+    except (TypeError, ValueError):  
+        return None  
+    if when is None:  
+        return None  
+    
+    now = now or datetime.now(timezone.utc)  
+    if when.tzinfo is None:  
+        when = when.replace(tzinfo=timezone.utc)  
+    return max(0.0, (when - now).total_seconds())  
+
+
+class HostBudget:  
+    """Batas konkurensi dan statistik satu host"""  
+
+    def __init__(self, limit: float):  
+        self.limit = limit  
+        self.in_flight = 0  
+        self.latency_ewma: Optional[float] = None  
+        self.cooldown_until = 0.0  
+        self.last_decrease = float('-inf')  
+        self.consecutive_throttles = 0  
+        self.requests = 0  
+        self.throttled = 0  
+        self.errors = 0  
+        self.completions: Deque[float] = deque()  
+
+
+class RequestSlot:  
+    """Satu slot permintaan; hasilnya dilaporkan lewat record()"""  
+
+    def __init__(self, controller: 'AdaptiveConcurrencyController', host: str):  
+        self.controller = controller  
+        self.host = host  
+        self.started = controller.clock()  
+        self.status_code: Optional[int] = None  
+        self.retry_after: Optional[float] = None  
+        self.error = False  
+
+    def record(self, status_code: Optional[int] = None, retry_after: Optional[str] = None) -> None:  
+        self.status_code = status_code  
+        self.retry_after = parse_retry_after(retry_after)  
+
+
+class AdaptiveConcurrencyController:  
+    """  
+    Mengatur jumlah permintaan paralel per host dengan AIMD: batas naik  
+    perlahan selama latensi sehat, dan turun berlipat saat server membalas  
+    429/503, gagal, atau latensi melewati target. Header Retry-After  
+    menahan host tersebut sampai waktu yang diminta, paling lama max_retry_after;  
+    tanpa header itu host ditahan dengan backoff eksponensial ber-jitter  
+    """  
+
+    def __init__(  
+        self,  
+        initial_limit: float = 2,  
+        min_limit: float = 1,  
+        max_limit: int = 16,  
+        latency_target: float = 2.0,  
+        additive_increase: float = 1.0,  
+        decrease_factor: float = 0.5,  
+        ewma_alpha: float = 0.3,  
+        rate_window: float = 10.0,  
+        max_retry_after: float = 300.0,  
+        backoff_base: float = 0.5,  
+        clock: Callable[[], float] = time.monotonic,  
+        jitter: Callable[[], float] = random.random  
+    ):  
+        if not 1 <= min_limit <= initial_limit <= max_limit:  
+            raise ValueError("Harus berlaku 1 <= min_limit <= initial_limit <= max_limit")  
+        if not 0 < decrease_factor < 1:  
+            raise ValueError("decrease_factor harus di antara 0 dan 1")  
+        if max_retry_after < 0:  
+            raise ValueError("max_retry_after tidak boleh negatif")  
+        if backoff_base < 0:  
+            raise ValueError("backoff_base tidak boleh negatif")  
+        
+        self.initial_limit = float(initial_limit)  
+        self.min_limit = float(min_limit)  
+        self.max_limit = int(max_limit)  
+        self.latency_target = latency_target  
+        self.additive_increase = additive_increase  
+        self.decrease_factor = decrease_factor  
+        self.ewma_alpha = ewma_alpha  
+        self.rate_window = rate_window  
+        self.max_retry_after = float(max_retry_after)  
+        self.backoff_base = float(backoff_base)  
+        self.clock = clock  
+        self.jitter = jitter  
+        
+        self._hosts: Dict[str, HostBudget] = {}  
+        self._condition = threading.Condition()  
+
+    def _budget(self, host: str) -> HostBudget:  
+        budget = self._hosts.get(host)  
+        if budget is None:  
+            budget = HostBudget(self.initial_limit)  
+            self._hosts[host] = budget  
+        return budget  
+
+    def acquire(self, host: str, timeout: Optional[float] = None) -> Optional[RequestSlot]:  
+        deadline = None if timeout is None else self.clock() + timeout  
+        
+        with self._condition:  
+            budget = self._budget(host)  
+            while True:  
+                now = self.clock()  
+                cooldown = budget.cooldown_until - now  
+                if cooldown <= 0 and budget.in_flight < int(budget.limit):  
+                    budget.in_flight += 1  
+                    budget.requests += 1  
+                    return RequestSlot(self, host)  
+                
+                wait = cooldown if cooldown > 0 else None  
+                if deadline is not None:  
+                    remaining = deadline - now  
+                    if remaining <= 0:  
+                        return None  
+                    wait = remaining if wait is None else min(wait, remaining)  
+                self._condition.wait(wait)  
+
+    def release(self, slot: RequestSlot) -> None:  
+        now = self.clock()  
+        latency = now - slot.started  
+        
+        with self._condition:  
+            budget = self._budget(slot.host)  
+            budget.in_flight = max(0, budget.in_flight - 1)  
+            budget.completions.append(now)  
+            while budget.completions and budget.completions[0] < now - self.rate_window:  
+                budget.completions.popleft()  
+            
+            if budget.latency_ewma is None:  
+                budget.latency_ewma = latency  
+            else:  
+                budget.latency_ewma += self.ewma_alpha * (latency - budget.latency_ewma)  
+            
+            throttled = slot.status_code in THROTTLE_STATUS_CODES  
+            if throttled:  
+                budget.throttled += 1  
+                budget.consecutive_throttles += 1  
+            else:  
+                budget.consecutive_throttles = 0  
+            if slot.error:  
+                budget.errors += 1  
+            
+            # Retry-After dibatasi agar server (atau header rusak) tidak menahan host tanpa batas  
+            if slot.retry_after is not None:  
+                cooldown = min(slot.retry_after, self.max_retry_after)  
+                budget.cooldown_until = max(budget.cooldown_until, now + cooldown)  
+            elif throttled:  
+                # Tanpa Retry-After: jeda berlipat setiap throttle beruntun, diacak  
+                # 50-100% agar worker yang ditolak bersamaan tidak kembali serentak  
+                delay = min(  
+                    self.backoff_base * 2 ** (budget.consecutive_throttles - 1),  
+                    self.max_retry_after  
+                )  
+                cooldown = delay * (0.5 + 0.5 * self.jitter())  
+                budget.cooldown_until = max(budget.cooldown_until, now + cooldown)  
+            
+            if throttled or slot.error or budget.latency_ewma > self.latency_target:  
+                self._decrease(budget, now)  
+            else:  
+                # Additive increase: kira-kira +1 setiap satu "jendela" permintaan sukses  
+                budget.limit = min(  
+                    float(self.max_limit),  
+                    budget.limit + self.additive_increase / max(budget.limit, 1.0)  
+                )  
+            
+            self._condition.notify_all()  
+
+    def _decrease(self, budget: HostBudget, now: float) -> None:  
+        # Satu penurunan per periode latensi agar sinyal beruntun tidak meruntuhkan batas  
+        if now - budget.last_decrease < (budget.latency_ewma or 0.0):  
+            return  
+        
+        previous = budget.limit  
+        budget.limit = max(self.min_limit, budget.limit * self.decrease_factor)  
+        budget.last_decrease = now  
+        logger.debug(f"Batas konkurensi turun dari {previous:.2f} ke {budget.limit:.2f}")  
+
+    @contextmanager  
+    def slot(self, host: str):  
+        slot = self.acquire(host)  
+        try:  
+            yield slot  
+        except Exception:  
+            slot.error = True  
+            raise  
+        finally:  
+            self.release(slot)  
+
+    def current_limit(self, host: str) -> int:  
+        with self._condition:  
+            return int(self._budget(host).limit)  
+
+    def snapshot(self) -> Dict[str, Dict]:  
+        now = self.clock()  
+        with self._condition:  
+            return {  
+                host: {  
+                    'limit': round(budget.limit, 2),  
+                    'in_flight': budget.in_flight,  
+                    'latency_ewma': None if budget.latency_ewma is None else round(budget.latency_ewma, 4),  
+                    'requests_per_second': round(  
+                        sum(1 for ts in budget.completions if ts >= now - self.rate_window) / self.rate_window, 3  
+                    ),  
+                    'cooldown_remaining': round(max(0.0, budget.cooldown_until - now), 3),  
+                    'requests': budget.requests,  
+                    'throttled': budget.throttled,  
+                    'errors': budget.errors  
+                }  
+                for host, budget in self._hosts.items()  
+            }  
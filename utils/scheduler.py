@@ -0,0 +1,330 @@
+import json  
+import logging  
+import os  
+import threading  
+import time as time_module  
+from datetime import datetime, time, timedelta  
+from typing import Dict, Optional, Set  
+
+# Konfigurasi Logging  
+logging.basicConfig(  
+    level=logging.INFO,  
+    format='%(asctime)s - %(levelname)s: %(message)s'  
+)  
+logger = logging.getLogger(__name__)  
+
+OVERLAP_POLICIES = ('skip', 'queue')  
+
+
+class CronSchedule:  
+    """  
+    Jadwal cron 5 kolom (menit jam tanggal bulan hari) yang mendukung  
+    '*', rentang 'a-b', langkah '*/n' atau 'a-b/n' dan daftar 'a,b,c'  
+    """  
+    
+    FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]  
+
+    def __init__(self, expression: str):  
+        fields = expression.split()  
+        if len(fields) != 5:  
+            raise ValueError(f"Ekspresi cron harus 5 kolom: {expression!r}")  
+        
+        self.expression = expression  
+        parsed = [self._parse_field(field, low, high) for field, (low, high) in zip(fields, self.FIELD_RANGES)]  
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed  
+        
+        # Minggu bisa ditulis 0 atau 7  
+        self.weekdays = {day % 7 for day in weekdays}  
+        # Seperti cron: kolom yang diawali '*' (termasuk '*/n') dianggap tidak membatasi  
+        self._any_day = fields[2].startswith('*')  
+        self._any_weekday = fields[4].startswith('*')  
+        self._sorted_hours = sorted(self.hours)  
+        self._sorted_minutes = sorted(self.minutes)  
+
+    @staticmethod  
+    def _parse_field(field: str, low: int, high: int) -> Set[int]:  
+        values = set()  
+        for part in field.split(','):  
+            base, _, step_text = part.partition('/')  
+            step = int(step_text) if step_text else 1  
+            if step < 1:  
+                raise ValueError(f"Langkah cron tidak valid: {part!r}")  
+            
+            if base == '*':  
+                start, end = low, high  
+            elif '-' in base:  
+                start, end = (int(value) for value in base.split('-', 1))  
+            else:  
+                start = int(base)  
+                end = high if step_text else start  
+            
+            if start < low or end > high or start > end:  
+                raise ValueError(f"Nilai cron di luar rentang {low}-{high}: {part!r}")  
+            values.update(range(start, end + 1, step))  
+        return values  
+
+    def _day_matches(self, day) -> bool:  
+        day_ok = day.day in self.days  
+        weekday_ok = (day.weekday() + 1) % 7 in self.weekdays  
+        
+        # Aturan cron: jika tanggal dan hari sama-sama dibatasi, cukup salah satu cocok  
+        if self._any_day or self._any_weekday:  
+            return day_ok and weekday_ok  
+        return day_ok or weekday_ok  
+
+    def next_after(self, after: datetime) -> datetime:  
+        start = after.replace(second=0, microsecond=0) + timedelta(minutes=1)  
+        day = start.date()  
+        
+        for _ in range(366 * 5):  
+            if day.month in self.months and self._day_matches(day):  
+                for hour in self._sorted_hours:  
+                    for minute in self._sorted_minutes:  
+                        candidate = datetime.combine(day, time(hour, minute))  
+                        if candidate >= start:  
+                            return candidate  
+            day += timedelta(days=1)  
+        
+        raise ValueError(f"Ekspresi cron tidak pernah terpenuhi: {self.expression!r}")  
+
+
+class RunLock:  
+    """  
+    Lock file antar proses (non-blocking) agar hanya satu run ETL yang  
+    menulis products.csv dan sink lainnya pada satu waktu  
+    """  
+
+    def __init__(self, path: str):  
+        self.path = os.path.abspath(path)  
+        self._handle = None  
+
+    def acquire(self) -> bool:  
+        if self._handle is not None:  
+            return True  
+        
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)  
+        handle = open(self.path, 'a+')  
+        try:  
+            if os.name == 'nt':  
+                import msvcrt  
+                handle.seek(0)  
+                msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)  
+            else:  
+                import fcntl  
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)  
+        except OSError:  
+            handle.close()  
+            return False  
+        
+        handle.seek(0)  
+        handle.truncate()  
+        handle.write(str(os.getpid()))  
+        handle.flush()  
+        self._handle = handle  
+        return True  
+
+    def release(self) -> None:  
+        if self._handle is None:  
+            return  
+        
+        try:  
+            if os.name == 'nt':  
+                import msvcrt  
+                self._handle.seek(0)  
+                msvcrt.locking(self._handle.fileno(), msvcrt.LK_UNLCK, 1)  
+            else:  
+                import fcntl  
+                fcntl.flock(self._handle.fileno(), fcntl.LOCK_UN)  
+        finally:  
+            self._handle.close()  
+            self._handle = None  
+
+    def __enter__(self) -> bool:  
+        return self.acquire()  
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:  
+        self.release()  
+
+
+class PipelineDaemon:  
+    """  
+    Menjalankan ETLPipeline berulang dalam satu proses berdasarkan interval  
+    atau jadwal cron. Objek pipeline (session HTTP, engine database, client  
+    Google Sheets) dipakai ulang di setiap run  
+    """  
+
+    def __init__(  
+        self,  
+        pipeline,  
+        interval: Optional[float] = None,  
+        cron: Optional[str] = None,  
+        lock_path: Optional[str] = None,  
+        status_path: Optional[str] = None,  
+        overlap: str = 'skip'  
+    ):  
+        if (interval is None) == (cron is None):  
+            raise ValueError("Tentukan tepat satu dari interval atau cron")  
+        if interval is not None and interval <= 0:  
+            raise ValueError("Interval harus lebih besar dari 0")  
+        if overlap not in OVERLAP_POLICIES:  
+            raise ValueError(f"overlap harus salah satu dari {OVERLAP_POLICIES}")  
+        
+        if lock_path is None:  
+            lock_path = os.path.join(os.getcwd(), 'etl.lock')  
+        
+        self.pipeline = pipeline  
+        self.interval = interval  
+        self.cron = CronSchedule(cron) if cron else None  
+        self.overlap = overlap  
+        self.lock = RunLock(lock_path)  
+        self.status_path = os.path.abspath(status_path) if status_path else None  
+        
+        self._state_lock = threading.Lock()  
+        self._stop = threading.Event()  
+        self._worker: Optional[threading.Thread] = None  
+        self._running = False  
+        self._pending = False  
+        self._status: Dict = {  
+            'state': 'idle',  
+            'runs': 0,  
+            'skipped': 0,  
+            'last_result': None,  
+            'last_started_at': None,  
+            'last_finished_at': None,  
+            'last_duration': None,  
+            'last_load_result': None,  
+            'next_run_at': None  
+        }  
+
+    def status(self) -> Dict:  
+        with self._state_lock:  
+            return dict(self._status)  
+
+    def _update_status(self, **changes) -> None:  
+        with self._state_lock:  
+            self._status.update(changes)  
+            snapshot = dict(self._status)  
+        
+        if self.status_path:  
+            try:  
+                tmp_path = f"{self.status_path}.tmp"  
+                with open(tmp_path, 'w') as f:  
+                    json.dump(snapshot, f, indent=2)  
+                os.replace(tmp_path, self.status_path)  
+            except Exception as e:  
+                logger.warning(f"Gagal menulis status daemon: {e}")  
+
+    def next_run_after(self, now: datetime, previous: Optional[datetime] = None) -> datetime:  
+        if self.cron:  
+            return self.cron.next_after(now)  
+        
+        # Interval dihitung dari jadwal sebelumnya agar tidak bergeser  
+        step = timedelta(seconds=self.interval)  
+        if previous is None:  
+            return now  
+        candidate = previous + step  
+        return candidate if candidate > now else now + step  
+
+    def trigger(self) -> bool:  
+        with self._state_lock:  
+            busy = self._running  
+            if not busy:  
+                self._running = True  
+            elif self.overlap == 'queue':  
+                self._pending = True  
+            else:  
+                self._status['skipped'] += 1  
+        
+        if busy:  
+            if self.overlap == 'queue':  
+                logger.info("Run sebelumnya masih berjalan, run berikutnya diantrekan")  
+            else:  
+                logger.warning("Run sebelumnya masih berjalan, run ini dilewati")  
+            self._update_status()  
+            return False  
+        
+        self._worker = threading.Thread(target=self._execute, name='etl-run', daemon=True)  
+        self._worker.start()  
+        return True  
+
+    def _execute(self) -> None:  
+        while True:  
+            self._run_once()  
+            
+            with self._state_lock:  
+                # Antrean digabung: beberapa trigger saat berjalan menjadi satu run  
+                if self._pending and not self._stop.is_set():  
+                    self._pending = False  
+                    continue  
+                self._pending = False  
+                self._running = False  
+                return  
+
+    @staticmethod  
+    def _run_result(load_result: Optional[Dict[str, bool]]) -> str:  
+        # Status diturunkan dari flag setiap sink, bukan dari ada tidaknya hasil  
+        if not load_result:  
+            return 'failed'  
+        if all(load_result.values()):  
+            return 'success'  
+        if any(load_result.values()):  
+            return 'partial'  
+        return 'failed'  
+
+    def _run_once(self) -> None:  
+        # Lock file mencegah tabrakan dengan proses lain (misalnya cron main.py)  
+        if not self.lock.acquire():  
+            with self._state_lock:  
+                self._status['skipped'] += 1  
+            self._update_status(last_result='skipped')  
+            logger.warning("Run ETL lain sedang berjalan di proses lain, run ini dilewati")  
+            return  
+        
+        started = time_module.monotonic()  
+        self._update_status(state='running', last_started_at=datetime.now().isoformat())  
+        try:  
+            load_result = self.pipeline.run()  
+            result = self._run_result(load_result)  
+        except Exception as e:  
+            logger.error(f"Run ETL gagal: {e}")  
+            load_result, result = {}, 'failed'  
+        finally:  
+            self.lock.release()  
+        
+        with self._state_lock:  
+            self._status['runs'] += 1  
+        self._update_status(  
+            state='idle',  
+            last_result=result,  
+            last_finished_at=datetime.now().isoformat(),  
+            last_duration=round(time_module.monotonic() - started, 3),  
+            last_load_result=load_result  
+        )  
+
+    def run_forever(self, max_ticks: Optional[int] = None) -> None:  
+        logger.info(  
+            f"Daemon ETL dimulai ({'cron ' + self.cron.expression if self.cron else f'interval {self.interval}s'})"  
+        )  
+        next_run = None  
+        ticks = 0  
+        
+        while not self._stop.is_set():  
+            next_run = self.next_run_after(datetime.now(), next_run)  
+            self._update_status(next_run_at=next_run.isoformat())  
+            
+            wait = (next_run - datetime.now()).total_seconds()  
+            if self._stop.wait(max(0.0, wait)):  
+                break  
+            
+            self.trigger()  
+            ticks += 1  
+            if max_ticks is not None and ticks >= max_ticks:  
+                break  
+        
+        self.stop()  
+
+    def stop(self, timeout: Optional[float] = None) -> None:  
+        self._stop.set()  
+        worker = self._worker  
+        if worker is not None and worker.is_alive() and worker is not threading.current_thread():  
+            worker.join(timeout)  
@@ -0,0 +1,291 @@
+import logging  
+import os  
+import re  
+from datetime import date, datetime, timedelta  
+from functools import lru_cache  
+from typing import Callable, List, Optional, Tuple  
+
+import pandas as pd  
+
+# Konfigurasi Logging  
+logging.basicConfig(  
+    level=logging.INFO,  
+    format='%(asctime)s - %(levelname)s: %(message)s'  
+)  
+logger = logging.getLogger(__name__)  
+
+# Tabel pencatat versi skema per tabel yang dikelola  
+MIGRATIONS_TABLE = 'etl_schema_migrations'  
+
+# Tipe enum untuk kolom Gender (hasil normalisasi DataTransformer)  
+GENDER_TYPE = 'fashion_gender'  
+GENDER_VALUES = ('Men', 'Women', 'Unisex', 'Unknown')  
+
+PRODUCT_COLUMNS = ['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender', 'Timestamp']  
+
+_IDENTIFIER_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')  
+_TIMEZONE_PATTERN = re.compile(r'^[A-Za-z0-9_+\-/]+$')  
+
+
+def _sql(statement: str):  
+    # sqlalchemy diimpor saat dibutuhkan agar impor modul ini tetap ringan  
+    from sqlalchemy import text  
+    return text(statement)  
+
+
+@lru_cache(maxsize=4096)  
+def to_utc_timestamp(value) -> Optional[pd.Timestamp]:  
+    # Timestamp tanpa zona waktu adalah waktu lokal host (pd.Timestamp.now()  
+    # pada data lama), bukan UTC  
+    if value is None or (isinstance(value, float) and value != value):  
+        return None  
+    
+    ts = pd.Timestamp(value)  
+    if ts is pd.NaT:  
+        return None  
+    if ts.tzinfo is None:  
+        return pd.Timestamp(ts.to_pydatetime(warn=False).astimezone()).tz_convert('UTC')  
+    return ts.tz_convert('UTC')  
+
+
+def to_utc(values) -> pd.Series:  
+    series = values if isinstance(values, pd.Series) else pd.Series(values)  
+    if isinstance(series.dtype, pd.DatetimeTZDtype):  
+        return series.dt.tz_convert('UTC')  
+    
+    # Satu batch hanya punya sedikit nilai unik sehingga konversi per nilai di-cache  
+    return pd.to_datetime(series.map(to_utc_timestamp), utc=True)  
+
+
+def host_timezone_sql() -> str:  
+    # Zona IANA host jika diketahui, selain itu offset host saat ini  
+    name = os.environ.get('TZ', '').lstrip(':')  
+    if not name:  
+        path = os.path.realpath('/etc/localtime')  
+        if '/zoneinfo/' in path:  
+            name = path.split('/zoneinfo/', 1)[1]  
+    if name and _TIMEZONE_PATTERN.match(name):  
+        return f"SET LOCAL TIME ZONE '{name}'"  
+    
+    offset = datetime.now().astimezone().utcoffset() or timedelta(0)  
+    minutes = int(offset.total_seconds() // 60)  
+    sign = '-' if minutes < 0 else '+'  
+    return f"SET LOCAL TIME ZONE INTERVAL '{sign}{abs(minutes) // 60:02d}:{abs(minutes) % 60:02d}' HOUR TO MINUTE"  
+
+
+def _validate_identifier(name: str) -> str:  
+    if not isinstance(name, str) or not _IDENTIFIER_PATTERN.match(name):  
+        raise ValueError(f"Nama tabel tidak valid: {name!r}")  
+    return name  
+
+
+def partition_name(table_name: str, day: date) -> str:  
+    return f"{_validate_identifier(table_name)}_p{day:%Y%m%d}"  
+
+
+def partition_bounds(day: date) -> Tuple[str, str]:  
+    # Batas partisi harian dalam UTC (inklusif, eksklusif)  
+    return (  
+        f"{day:%Y-%m-%d} 00:00:00+00",  
+        f"{day + timedelta(days=1):%Y-%m-%d} 00:00:00+00"  
+    )  
+
+
+def create_table_sql(table_name: str) -> str:  
+    table = _validate_identifier(table_name)  
+    return f'''  
+        CREATE TABLE IF NOT EXISTS {table} (  
+            "id" BIGSERIAL NOT NULL,  
+            "Title" TEXT NOT NULL,  
+            "Price" NUMERIC(14, 2) NOT NULL CHECK ("Price" >= 0),  
+            "Rating" NUMERIC(3, 2) NOT NULL CHECK ("Rating" BETWEEN 0 AND 5),  
+            "Colors" SMALLINT NOT NULL CHECK ("Colors" >= 0),  
+            "Size" VARCHAR(16) NOT NULL,  
+            "Gender" {GENDER_TYPE} NOT NULL,  
+            "Timestamp" TIMESTAMPTZ NOT NULL,  
+            PRIMARY KEY ("id", "Timestamp")  
+        ) PARTITION BY RANGE ("Timestamp")  
+    '''  
+
+
+def create_indexes_sql(table_name: str) -> List[str]:  
+    table = _validate_identifier(table_name)  
+    # Indeks pada tabel induk otomatis diturunkan ke setiap partisi  
+    return [  
+        f'CREATE INDEX IF NOT EXISTS ix_{table}_title ON {table} ("Title")',  
+        f'CREATE INDEX IF NOT EXISTS ix_{table}_gender_size_price '  
+        f'ON {table} ("Gender", "Size", "Price")',  
+        f'CREATE INDEX IF NOT EXISTS ix_{table}_size ON {table} ("Size")',  
+    ]  
+
+
+def create_partition_sql(table_name: str, day: date) -> str:  
+    table = _validate_identifier(table_name)  
+    lower, upper = partition_bounds(day)  
+    return (  
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, day)} "  
+        f"PARTITION OF {table} FOR VALUES FROM ('{lower}') TO ('{upper}')"  
+    )  
+
+
+def _create_gender_type_sql() -> str:  
+    values = ', '.join(f"'{value}'" for value in GENDER_VALUES)  
+    return f'''  
+        DO $$ BEGIN  
+            CREATE TYPE {GENDER_TYPE} AS ENUM ({values});  
+        EXCEPTION  
+            WHEN duplicate_object THEN NULL;  
+        END $$  
+    '''  
+
+
+class PostgresSchemaManager:  
+    """  
+    Membuat dan memigrasikan skema tabel produk di PostgreSQL: kolom bertipe,  
+    primary key, indeks sekunder dan partisi harian berdasarkan tanggal scraping  
+    """  
+
+    def __init__(self, table_name: str = 'fashion_products'):  
+        self.table_name = _validate_identifier(table_name)  
+        
+        # Daftar migrasi berurutan; indeks + 1 adalah nomor versi  
+        self.migrations: List[Callable] = [  
+            self._migration_001_partitioned_table,  
+        ]  
+
+    @property  
+    def latest_version(self) -> int:  
+        return len(self.migrations)  
+
+    def _relkind(self, conn, relation: str) -> Optional[str]:  
+        return conn.execute(  
+            _sql("SELECT relkind FROM pg_class WHERE oid = to_regclass(:name)"),  
+            {'name': relation}  
+        ).scalar()  
+
+    def current_version(self, conn) -> int:  
+        conn.execute(_sql(f'''  
+            CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} (  
+                table_name TEXT PRIMARY KEY,  
+                version INTEGER NOT NULL,  
+                applied_at TIMESTAMPTZ NOT NULL DEFAULT now()  
+            )  
+        '''))  
+        version = conn.execute(  
+            _sql(f"SELECT version FROM {MIGRATIONS_TABLE} WHERE table_name = :table"),  
+            {'table': self.table_name}  
+        ).scalar()  
+        return int(version) if isinstance(version, int) else 0  
+
+    def migrate(self, conn) -> int:  
+        # Timestamp tanpa zona waktu di tabel lama ditulis dalam waktu lokal host  
+        conn.execute(_sql(host_timezone_sql()))  
+        
+        version = self.current_version(conn)  
+        for number, migration in enumerate(self.migrations, start=1):  
+            if number <= version:  
+                continue  
+            
+            logger.info(f"Menjalankan migrasi skema {self.table_name} versi {number}")  
+            migration(conn)  
+            conn.execute(  
+                _sql(f'''  
+                    INSERT INTO {MIGRATIONS_TABLE} (table_name, version)  
+                    VALUES (:table, :version)  
+                    ON CONFLICT (table_name)  
+                    DO UPDATE SET version = EXCLUDED.version, applied_at = now()  
+                '''),  
+                {'table': self.table_name, 'version': number}  
+            )  
+            version = number  
+        
+        return version  
+
+    def _migration_001_partitioned_table(self, conn) -> None:  
+        table = self.table_name  
+        legacy = f"{table}_legacy"  
+        
+        # Tabel lama hasil to_sql(if_exists='replace') adalah tabel biasa ('r')  
+        has_legacy = self._relkind(conn, table) == 'r'  
+        if has_legacy:  
+            logger.info(f"Memindahkan tabel lama {table} ke {legacy}")  
+            conn.execute(_sql(f"ALTER TABLE {table} RENAME TO {legacy}"))  
+        
+        conn.execute(_sql(_create_gender_type_sql()))  
+        conn.execute(_sql(create_table_sql(table)))  
+        for statement in create_indexes_sql(table):  
+            conn.execute(_sql(statement))  
+        
+        if not has_legacy:  
+            return  
+        
+        days = conn.execute(_sql(f'''  
+            SELECT DISTINCT ("Timestamp"::timestamptz AT TIME ZONE 'UTC')::date  
+            FROM {legacy} WHERE "Timestamp" IS NOT NULL  
+        ''')).scalars().all()  
+        for day in days:  
+            conn.execute(_sql(create_partition_sql(table, day)))  
+        
+        conn.execute(_sql(f'''  
+            INSERT INTO {table}  
+                ("Title", "Price", "Rating", "Colors", "Size", "Gender", "Timestamp")  
+            SELECT "Title", "Price"::numeric, "Rating"::numeric, "Colors"::smallint,  
+                   "Size", "Gender"::text::{GENDER_TYPE}, "Timestamp"::timestamptz  
+            FROM {legacy}  
+            WHERE "Title" IS NOT NULL AND "Price" IS NOT NULL  
+              AND "Rating" IS NOT NULL AND "Colors" IS NOT NULL  
+              AND "Size" IS NOT NULL AND "Gender" IS NOT NULL  
+              AND "Timestamp" IS NOT NULL  
+        '''))  
+        conn.execute(_sql(f"DROP TABLE {legacy}"))  
+
+    @staticmethod  
+    def prepare_frame(df: pd.DataFrame) -> pd.DataFrame:  
+        # Samakan tipe kolom DataFrame dengan skema tabel  
+        prepared = df[PRODUCT_COLUMNS].copy()  
+        prepared['Price'] = prepared['Price'].astype(float).round(2)  
+        prepared['Rating'] = prepared['Rating'].astype(float).round(2)  
+        prepared['Colors'] = prepared['Colors'].astype(int)  
+        prepared['Timestamp'] = to_utc(prepared['Timestamp'])  
+        return prepared  
+
+    @staticmethod  
+    def partition_days(timestamps: pd.Series) -> List[date]:  
+        utc = to_utc(timestamps)  
+        return sorted({ts.date() for ts in utc.dropna()})  
+
+    def ensure_partitions(self, conn, timestamps: pd.Series) -> List[str]:  
+        created = []  
+        for day in self.partition_days(timestamps):  
+            conn.execute(_sql(create_partition_sql(self.table_name, day)))  
+            created.append(partition_name(self.table_name, day))  
+        return created  
+
+    def list_partitions(self, conn) -> List[Tuple[str, date]]:  
+        names = conn.execute(  
+            _sql('''  
+                SELECT c.relname FROM pg_inherits i  
+                JOIN pg_class c ON c.oid = i.inhrelid  
+                WHERE i.inhparent = to_regclass(:table)  
+            '''),  
+            {'table': self.table_name}  
+        ).scalars().all()  
+        
+        partitions = []  
+        prefix = f"{self.table_name}_p"  
+        for name in names:  
+            suffix = name[len(prefix):] if name.startswith(prefix) else ''  
+            try:  
+                partitions.append((name, datetime.strptime(suffix, '%Y%m%d').date()))  
+            except ValueError:  
+                continue  
+        return sorted(partitions, key=lambda item: item[1])  
+
+    def drop_partitions_before(self, conn, cutoff: date) -> List[str]:  
+        # Menghapus partisi jauh lebih murah daripada DELETE seluruh tabel  
+        dropped = []  
+        for name, day in self.list_partitions(conn):  
+            if day < cutoff:  
+                conn.execute(_sql(f"DROP TABLE IF EXISTS {name}"))  
+                dropped.append(name)  
+        return dropped  
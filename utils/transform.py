@@ -1,9 +1,13 @@
 import logging  
+import multiprocessing  
 import re  
-from typing import Optional  
+from concurrent.futures import ProcessPoolExecutor  
+from typing import List, Optional, Tuple  
 import pandas as pd  
 import numpy as np  
 
+from utils.dedup import NearDuplicateDetector  
+
 # Konfigurasi Logging  
 logging.basicConfig(  
     level=logging.INFO,   
@@ -11,7 +15,35 @@ logging.basicConfig(
 )  
 logger = logging.getLogger(__name__)  
 
+# Tipe kolom hasil pembersihan, sama untuk jalur sekuensial dan paralel  
+CLEAN_DTYPES = {'Price': 'float64', 'Rating': 'float64', 'Colors': 'int64'}  
+
+# DataFrame sumber untuk worker paralel; diwarisi proses anak lewat fork (copy-on-write)  
+_PARTITION_SOURCE: Optional[pd.DataFrame] = None  
+
+
+def _clean_partition(bounds: Tuple[int, int]) -> pd.DataFrame:  
+    # Worker hanya menerima rentang baris, bukan isi baris  
+    start, stop = bounds  
+    return DataTransformer._clean(_PARTITION_SOURCE.iloc[start:stop].copy())  
+
+
 class DataTransformer:  
+    def __init__(  
+        self,  
+        workers: int = 1,  
+        min_rows_per_worker: int = 5000,  
+        near_duplicate_threshold: Optional[float] = None  
+    ):  
+        # workers > 1 mengaktifkan pembersihan paralel per rentang baris  
+        self.workers = max(1, int(workers))  
+        self.min_rows_per_worker = max(1, int(min_rows_per_worker))  
+        
+        # Deduplikasi judul yang hampir sama hanya aktif jika threshold diberikan  
+        self.near_duplicates = None  
+        if near_duplicate_threshold is not None:  
+            self.near_duplicates = NearDuplicateDetector(threshold=near_duplicate_threshold)  
+
     @staticmethod  
     def _clean_rating(rating: str) -> Optional[float]:  
         try:  
@@ -76,35 +108,77 @@ class DataTransformer:
         
         return gender_map.get(clean_gender, 'Unknown')  
 
-    def transform(self, df: pd.DataFrame) -> pd.DataFrame:   
+    @classmethod  
+    def _clean(cls, df: pd.DataFrame) -> pd.DataFrame:  
+        # Pembersihan dan transformasi kolom (per baris, aman dipartisi)  
+        df['Rating'] = df['Rating'].apply(cls._clean_rating)  
+        df['Price'] = df['Price'].apply(cls._clean_price)  
+        df['Colors'] = df['Colors'].apply(cls._clean_colors)  
+        df['Size'] = df['Size'].apply(cls._normalize_size)  
+        df['Gender'] = df['Gender'].apply(cls._normalize_gender)  
+        
+        # Hapus baris dengan data tidak valid  
+        df.dropna(  
+            subset=['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender'],  
+            inplace=True  
+        )  
+        
+        # Tipe kolom ditetapkan eksplisit agar tidak bergantung pada isi partisi  
+        # (partisi yang seluruh barisnya tidak valid menghasilkan kolom object)  
+        return df.astype(CLEAN_DTYPES)  
+
+    def _partitions(self, total_rows: int, workers: int) -> List[Tuple[int, int]]:  
+        step = -(-total_rows // workers)  
+        return [(start, min(start + step, total_rows)) for start in range(0, total_rows, step)]  
+
+    def _clean_parallel(self, df: pd.DataFrame, workers: int) -> pd.DataFrame:  
+        global _PARTITION_SOURCE  
+        
+        _PARTITION_SOURCE = df  
+        try:  
+            context = multiprocessing.get_context('fork')  
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:  
+                # map mempertahankan urutan partisi sehingga urutan baris tetap  
+                parts = list(executor.map(_clean_partition, self._partitions(len(df), workers)))  
+        finally:  
+            _PARTITION_SOURCE = None  
+        
+        # Partisi kosong tidak ikut menentukan tipe hasil penggabungan  
+        non_empty = [part for part in parts if not part.empty]  
+        return pd.concat(non_empty or parts[:1])  
+
+    def transform(self, df: pd.DataFrame, workers: Optional[int] = None) -> pd.DataFrame:  
         try:  
             # Validasi input  
             if df is None or df.empty:  
                 logger.warning("DataFrame kosong atau None")  
                 return pd.DataFrame()  
             
-            # Buat salinan DataFrame  
-            transformed_df = df.copy()  
+            workers = self.workers if workers is None else max(1, int(workers))  
+            workers = min(workers, len(df) // self.min_rows_per_worker)  
             
-            # Pembersihan dan transformasi kolom  
-            transformed_df['Rating'] = transformed_df['Rating'].apply(self._clean_rating)  
-            transformed_df['Price'] = transformed_df['Price'].apply(self._clean_price)  
-            transformed_df['Colors'] = transformed_df['Colors'].apply(self._clean_colors)  
-            transformed_df['Size'] = transformed_df['Size'].apply(self._normalize_size)  
-            transformed_df['Gender'] = transformed_df['Gender'].apply(self._normalize_gender)  
+            if workers > 1 and 'fork' not in multiprocessing.get_all_start_methods():  
+                logger.warning("Start method 'fork' tidak tersedia, transformasi dijalankan tanpa paralel")  
+                workers = 1  
             
-            # Hapus baris dengan data tidak valid  
-            transformed_df.dropna(  
-                subset=['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender'],   
-                inplace=True  
-            )  
+            if workers > 1:  
+                logger.info(f"Transformasi paralel dengan {workers} proses")  
+                transformed_df = self._clean_parallel(df, workers)  
+            else:  
+                # Buat salinan DataFrame  
+                transformed_df = self._clean(df.copy())  
             
             # Tambahkan kolom timestamp  
-            transformed_df['Timestamp'] = pd.Timestamp.now().isoformat()  
+            # Waktu scraping dicatat dalam UTC dengan offset eksplisit  
+            transformed_df['Timestamp'] = pd.Timestamp.now(tz='UTC').isoformat()  
             
-            # Hapus duplikat  
+            # Hapus duplikat secara global setelah semua partisi digabung  
             transformed_df.drop_duplicates(inplace=True)  
             
+            # Hapus produk yang sama dengan variasi judul kecil  
+            if self.near_duplicates is not None:  
+                transformed_df = self.near_duplicates.deduplicate(transformed_df)  
+            
             logger.info(f"Transformasi data berhasil. Jumlah data: {len(transformed_df)}")  
             return transformed_df  
         
@@ -112,6 +186,43 @@ class DataTransformer:
             logger.error(f"Gagal melakukan transformasi: {e}")  
             return pd.DataFrame()  
 
+    def transform_arrow(self, table):  
+        try:  
+            from utils import columnar  
+            pa, _ = columnar.require_pyarrow()  
+            
+            # Validasi input  
+            if table is None or table.num_rows == 0:  
+                logger.warning("Tabel Arrow kosong atau None")  
+                return None  
+            
+            # Kolom dibersihkan dengan pyarrow.compute; Size/Gender dinormalisasi per nilai unik  
+            transformed = columnar.clean_table(table, self._normalize_size, self._normalize_gender)  
+            
+            # Tambahkan kolom timestamp  
+            transformed = transformed.append_column(  
+                'Timestamp',  
+                pa.repeat(pa.scalar(pd.Timestamp.now(tz='UTC').isoformat(), pa.string()), transformed.num_rows)  
+            )  
+            
+            # Hapus duplikat dengan group-by, baris pertama tiap grup dipertahankan  
+            transformed = columnar.drop_duplicate_rows(transformed)  
+            
+            # Deteksi duplikat mirip hanya membutuhkan kolom judul dan atribut blok  
+            if self.near_duplicates is not None and transformed.num_rows > 0:  
+                keys = transformed.select(['Title', 'Price', 'Size', 'Gender']).to_pandas()  
+                labels = self.near_duplicates.find_clusters(keys)  
+                transformed = transformed.filter(pa.array(labels == np.arange(len(labels))))  
+            
+            logger.info(f"Transformasi data (Arrow) berhasil. Jumlah data: {transformed.num_rows}")  
+            return transformed  
+        
+        except ImportError:  
+            raise  
+        except Exception as e:  
+            logger.error(f"Gagal melakukan transformasi Arrow: {e}")  
+            return None  
+
 def transform_data(df: pd.DataFrame) -> pd.DataFrame:  
     # Validasi input  
     if not isinstance(df, pd.DataFrame):  
@@ -0,0 +1,280 @@
+import hashlib  
+import json  
+import logging  
+import os  
+import re  
+from typing import Dict, Iterable, List, Optional  
+
+import pandas as pd  
+
+from utils.schema import to_utc  
+
+# Konfigurasi Logging  
+logging.basicConfig(  
+    level=logging.INFO,  
+    format='%(asctime)s - %(levelname)s: %(message)s'  
+)  
+logger = logging.getLogger(__name__)  
+
+DIGEST_COLUMNS = ['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender', 'Timestamp']  
+HASH_MODULUS = 2 ** 64  
+
+
+def canonical_rows(df: pd.DataFrame) -> pd.Series:  
+    # Format baris harus sama persis dengan ekspresi SQL di postgresql_digest_sql  
+    timestamps = to_utc(df['Timestamp'])  
+    return (  
+        df['Title'].astype(str) + '|'  
+        + df['Price'].astype(float).round(2).map('{:.2f}'.format) + '|'  
+        + df['Rating'].astype(float).round(2).map('{:.2f}'.format) + '|'  
+        + df['Colors'].astype(int).astype(str) + '|'  
+        + df['Size'].astype(str) + '|'  
+        + df['Gender'].astype(str) + '|'  
+        + timestamps.dt.strftime('%Y-%m-%dT%H:%M:%S.%f')  
+    )  
+
+
+def row_hash(row: str) -> int:  
+    # 64 bit pertama md5 sebagai bilangan bertanda, sama seperti ::bit(64)::bigint  
+    return int.from_bytes(hashlib.md5(row.encode('utf-8')).digest()[:8], 'big', signed=True)  
+
+
+def postgresql_digest_sql(table_name: str) -> str:  
+    if not re.match(r'^[A-Za-z_][A-Za-z0-9_]*$', table_name):  
+        raise ValueError(f"Nama tabel tidak valid: {table_name!r}")  
+    
+    return f'''  
+        SELECT to_char(("Timestamp" AT TIME ZONE 'UTC')::date, 'YYYY-MM-DD') AS partition,  
+               count(*) AS rows,  
+               sum(('x' || substr(md5(concat_ws('|',  
+                   "Title",  
+                   to_char("Price", 'FM999999999990.00'),  
+                   to_char("Rating", 'FM0.00'),  
+                   "Colors"::text,  
+                   "Size",  
+                   "Gender"::text,  
+                   to_char("Timestamp" AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS.US')  
+               )), 1, 16))::bit(64)::bigint) AS hash_sum  
+        FROM {table_name}  
+        WHERE "Timestamp" = ANY(:timestamps)  
+        GROUP BY 1  
+    '''  
+
+
+class BatchDigest:  
+    """  
+    Ringkasan isi batch yang tidak bergantung urutan baris: jumlah baris dan  
+    jumlah hash baris (mod 2^64) per partisi tanggal scraping (UTC)  
+    """  
+
+    def __init__(self, partitions: Optional[Dict[str, Dict]] = None, timestamps: Optional[List[str]] = None):  
+        self.partitions = partitions or {}  
+        self.timestamps = timestamps or []  
+
+    @classmethod  
+    def from_frame(cls, df: pd.DataFrame) -> 'BatchDigest':  
+        missing_columns = [col for col in DIGEST_COLUMNS if col not in df.columns]  
+        if missing_columns:  
+            raise ValueError(f"Kolom hilang: {missing_columns}")  
+        
+        data = df[DIGEST_COLUMNS].dropna()  
+        timestamps = to_utc(data['Timestamp'])  
+        frame = pd.DataFrame({  
+            'partition': timestamps.dt.strftime('%Y-%m-%d'),  
+            'hash': canonical_rows(data).map(row_hash)  
+        })  
+        
+        partitions = {}  
+        for partition, group in frame.groupby('partition'):  
+            partitions[partition] = {  
+                'rows': int(len(group)),  
+                'hash': f"{sum(group['hash']) % HASH_MODULUS:016x}"  
+            }  
+        
+        unique_timestamps = sorted({ts.isoformat() for ts in timestamps})  
+        return cls(partitions, unique_timestamps)  
+
+    @classmethod  
+    def from_csv(cls, path: str) -> 'BatchDigest':  
+        # Dihitung dari file yang sudah ditulis, bukan dari DataFrame sumbernya  
+        df = pd.read_csv(path, dtype={'Title': str, 'Size': str, 'Gender': str}, keep_default_na=False)  
+        return cls.from_frame(df)  
+
+    @classmethod  
+    def from_values(cls, values: List[List]) -> 'BatchDigest':  
+        # Baris pertama adalah header, sama seperti body yang dikirim ke Google Sheets  
+        return cls.from_frame(pd.DataFrame(values[1:], columns=values[0]))  
+
+    @classmethod  
+    def from_aggregates(cls, rows: Iterable) -> 'BatchDigest':  
+        # Hasil agregat server: (partition, rows, hash_sum)  
+        partitions = {}  
+        for partition, count, hash_sum in rows:  
+            partitions[str(partition)] = {  
+                'rows': int(count),  
+                'hash': f"{int(hash_sum or 0) % HASH_MODULUS:016x}"  
+            }  
+        return cls(partitions)  
+
+    @classmethod  
+    def from_dict(cls, data: Dict) -> 'BatchDigest':  
+        return cls(data.get('partitions', {}), data.get('timestamps', []))  
+
+    def to_dict(self) -> Dict:  
+        return {'partitions': self.partitions, 'timestamps': self.timestamps}  
+
+    @property  
+    def total_rows(self) -> int:  
+        return sum(partition['rows'] for partition in self.partitions.values())  
+
+    def mismatched_partitions(self, other: 'BatchDigest') -> List[str]:  
+        return sorted(  
+            partition for partition in set(self.partitions) | set(other.partitions)  
+            if self.partitions.get(partition) != other.partitions.get(partition)  
+        )  
+
+
+class ConsistencyVerifier:  
+    """  
+    Memeriksa kesamaan isi sink dengan digest batch: PostgreSQL dibandingkan  
+    dengan agregat hash di sisi server, CSV dan Google Sheets dengan manifest  
+    berisi digest dari data yang benar-benar ditulis (file CSV yang dibaca ulang,  
+    nilai yang dikirim ke API). CSV yang berubah setelah ditulis di-hash ulang  
+    """  
+
+    def __init__(self, manifest_dir: Optional[str] = None):  
+        if manifest_dir is None:  
+            manifest_dir = os.path.join(os.getcwd(), 'manifests')  
+        self.manifest_dir = os.path.abspath(manifest_dir)  
+
+    def manifest_path(self, sink: str, key: str) -> str:  
+        safe_key = re.sub(r'[^A-Za-z0-9_.-]+', '_', key).strip('_')  
+        return os.path.join(self.manifest_dir, f"{sink}_{safe_key}.json")  
+
+    def write_manifest(self, sink: str, key: str, digest: BatchDigest, **extra) -> str:  
+        os.makedirs(self.manifest_dir, exist_ok=True)  
+        path = self.manifest_path(sink, key)  
+        
+        manifest = {'sink': sink, 'key': key, 'digest': digest.to_dict()}  
+        manifest.update(extra)  
+        
+        tmp_path = f"{path}.tmp"  
+        with open(tmp_path, 'w') as f:  
+            json.dump(manifest, f, indent=2)  
+        os.replace(tmp_path, path)  
+        return path  
+
+    def read_manifest(self, sink: str, key: str) -> Optional[Dict]:  
+        path = self.manifest_path(sink, key)  
+        if not os.path.exists(path):  
+            return None  
+        with open(path, 'r') as f:  
+            return json.load(f)  
+
+    @staticmethod  
+    def _report(digest: BatchDigest, actual: Optional[BatchDigest], reason: Optional[str] = None) -> Dict:  
+        if actual is None:  
+            mismatched = sorted(digest.partitions)  
+        else:  
+            mismatched = digest.mismatched_partitions(actual)  
+            if mismatched and reason is None:  
+                reason = 'isi partisi berbeda'  
+        
+        return {  
+            'ok': not mismatched and reason is None,  
+            'rows': digest.total_rows,  
+            'mismatched_partitions': mismatched,  
+            'reason': reason  
+        }  
+
+    def verify_csv(self, digest: BatchDigest, csv_path: str) -> Dict:  
+        csv_path = os.path.abspath(csv_path)  
+        if not os.path.exists(csv_path):  
+            return self._report(digest, None, 'file tidak ditemukan')  
+        
+        # Selama ukuran dan mtime sama, digest hasil baca ulang saat penulisan  
+        # masih berlaku; selain itu isi file di-hash ulang per partisi  
+        manifest = self.read_manifest('csv', csv_path)  
+        stat = os.stat(csv_path)  
+        if (  
+            manifest is not None  
+            and stat.st_size == manifest.get('size')  
+            and stat.st_mtime_ns == manifest.get('mtime_ns')  
+        ):  
+            return self._report(digest, BatchDigest.from_dict(manifest['digest']))  
+        
+        return self._report(digest, BatchDigest.from_csv(csv_path))  
+
+    def verify_google_sheets(self, digest: BatchDigest, spreadsheet_id: str, range_name: str) -> Dict:  
+        manifest = self.read_manifest('google_sheets', f"{spreadsheet_id}_{range_name}")  
+        if manifest is None:  
+            return self._report(digest, None, 'manifest tidak ditemukan')  
+        
+        # updatedRows dilaporkan oleh API saat penulisan (termasuk baris header);  
+        # jumlah yang kurang tidak bisa ditelusuri ke partisi tertentu  
+        updated_rows = manifest.get('updated_rows')  
+        if updated_rows is not None and updated_rows != digest.total_rows + 1:  
+            return self._report(digest, None, f"API melaporkan {updated_rows} baris")  
+        
+        return self._report(digest, BatchDigest.from_dict(manifest['digest']))  
+
+    def verify_postgresql(self, digest: BatchDigest, engine, table_name: str = 'fashion_products') -> Dict:  
+        from sqlalchemy import text  
+        
+        timestamps = [pd.Timestamp(ts).to_pydatetime() for ts in digest.timestamps]  
+        with engine.connect() as conn:  
+            rows = conn.execute(  
+                text(postgresql_digest_sql(table_name)),  
+                {'timestamps': timestamps}  
+            ).all()  
+        
+        return self._report(digest, BatchDigest.from_aggregates(rows))  
+
+
+def verify_load(  
+    digest: BatchDigest,  
+    loader,  
+    csv_path: Optional[str] = None,  
+    postgresql_config: Optional[Dict[str, str]] = None,  
+    google_sheets_config: Optional[Dict[str, str]] = None  
+) -> Dict[str, Dict]:  
+    verifier = loader.verifier  
+    reports = {}  
+    
+    checks = []  
+    if csv_path:  
+        checks.append(('csv', lambda: verifier.verify_csv(digest, csv_path)))  
+    if postgresql_config:  
+        checks.append(('postgresql', lambda: verifier.verify_postgresql(  
+            digest,  
+            loader._get_engine(postgresql_config.get('connection_string', '')),  
+            postgresql_config.get('table_name', 'fashion_products')  
+        )))  
+    if google_sheets_config:  
+        checks.append(('google_sheets', lambda: verifier.verify_google_sheets(  
+            digest,  
+            google_sheets_config.get('spreadsheet_id', ''),  
+            google_sheets_config.get('range_name', 'Sheet1!A1')  
+        )))  
+    
+    for sink, check in checks:  
+        try:  
+            reports[sink] = check()  
+        except Exception as e:  
+            logger.error(f"Gagal memverifikasi {sink}: {e}")  
+            reports[sink] = {  
+                'ok': False,  
+                'rows': digest.total_rows,  
+                'mismatched_partitions': sorted(digest.partitions),  
+                'reason': str(e)  
+            }  
+        
+        if reports[sink]['ok']:  
+            logger.info(f"Verifikasi {sink} cocok: {reports[sink]['rows']} baris")  
+        else:  
+            logger.warning(  
+                f"Verifikasi {sink} gagal ({reports[sink]['reason']}), "  
+                f"partisi: {reports[sink]['mismatched_partitions']}"  
+            )  
+    
+    return reports  